@@ -0,0 +1,978 @@
+# app_ui.py
+#
+# The DocWise interface. Start it through App.py, which imports this module
+# only once the app actually runs.
+
+import time
+
+# Reference point for the time-to-first-frame measurement
+APP_START = time.perf_counter()
+
+from kivy.uix.screenmanager import ScreenManager, Screen
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.properties import StringProperty
+from kivymd.app import MDApp
+from kivymd.uix.button import MDRaisedButton, MDFlatButton
+from kivymd.uix.dialog import MDDialog
+from kivymd.uix.textfield import MDTextField
+from kivymd.uix.selectioncontrol import MDCheckbox
+from kivymd.uix.boxlayout import MDBoxLayout
+from kivymd.uix.label import MDLabel
+from kivymd.uix.scrollview import MDScrollView
+from kivymd.uix.card import MDCard
+from kivymd.uix.toolbar import MDTopAppBar
+from kivy.metrics import dp
+from kivy.clock import Clock
+from kivy.logger import Logger
+from plyer import filechooser
+
+# ------------------ Import Your Modules ------------------
+from modules import disease_mapper, pdf_analyzer
+from modules.analysis_worker import AnalysisExecutor
+from modules.disease_mapper import match_conditions
+from modules.doctor_filtering import start_watcher
+from modules.doctor_ranking import ranked_search, search_doctors
+from modules.typeahead import suggest_conditions, suggest_locations
+
+ANALYSIS_STAGE_TEXT = {
+    "extraction": "Extracting text from report",
+    "symptoms": "Detecting symptoms and conditions",
+    "summarizing": "Summarizing report ({current}% read)",
+    "reducing": "Condensing section summaries (level {current})",
+    "final": "Writing final summary"
+}
+
+# Start loading the NLP/summarization models once the role screen is up
+WARM_UP_MODELS = True
+
+# Typeahead waits this long after the last keystroke before suggesting
+TYPEAHEAD_DEBOUNCE = 0.15
+TYPEAHEAD_SUGGESTIONS = 3
+
+# Doctors shown per page of search results
+RESULTS_PAGE_SIZE = 20
+
+class ProfessionalRoleScreen(Screen):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        
+        # Main container with professional background
+        main_layout = MDBoxLayout(
+            orientation="vertical",
+            padding=0,
+            spacing=0,
+            md_bg_color=[0.98, 0.98, 0.98, 1]
+        )
+        
+        # Header section with professional blue
+        header = MDBoxLayout(
+            orientation="vertical",
+            size_hint_y=None,
+            height=dp(300),
+            padding=[dp(40), dp(60), dp(40), dp(20)],
+            md_bg_color=[0.07, 0.45, 0.87, 1]
+        )
+        
+        # App logo and title
+        logo_section = MDBoxLayout(
+            orientation="vertical",
+            spacing=dp(10),
+            size_hint_y=None,
+            height=dp(120)
+        )
+        
+        app_name = MDLabel(
+            text="DOCWISE AI",
+            halign="center",
+            font_style="H4",
+            theme_text_color="Custom",
+            text_color=[1, 1, 1, 1],
+            bold=True
+        )
+        
+        tagline = MDLabel(
+            text="Advanced Healthcare Intelligence Platform",
+            halign="center",
+            font_style="Subtitle1",
+            theme_text_color="Custom",
+            text_color=[1, 1, 1, 0.9]
+        )
+        
+        logo_section.add_widget(app_name)
+        logo_section.add_widget(tagline)
+        header.add_widget(logo_section)
+        
+        main_layout.add_widget(header)
+        
+        # Content section
+        content = MDBoxLayout(
+            orientation="vertical",
+            padding=[dp(40), dp(40), dp(40), dp(20)],
+            spacing=dp(30),
+            size_hint_y=None,
+            height=dp(400)
+        )
+        
+        # Role selection card
+        role_card = MDCard(
+            orientation="vertical",
+            padding=dp(30),
+            size_hint_y=None,
+            height=dp(280),
+            elevation=8,
+            radius=[dp(15),],
+            md_bg_color=[1, 1, 1, 1]
+        )
+        
+        role_title = MDLabel(
+            text="Select Your Role",
+            halign="center",
+            font_style="H5",
+            theme_text_color="Primary",
+            size_hint_y=None,
+            height=dp(40)
+        )
+        role_card.add_widget(role_title)
+        
+        # Role options
+        role_options = MDBoxLayout(
+            orientation="vertical",
+            spacing=dp(20),
+            size_hint_y=None,
+            height=dp(120)
+        )
+        
+        # Doctor option
+        doctor_option = MDBoxLayout(
+            orientation="horizontal",
+            spacing=dp(15),
+            size_hint_y=None,
+            height=dp(50)
+        )
+        self.doctor_check = MDCheckbox(
+            group="role",
+            size_hint=(None, None),
+            size=(dp(30), dp(30))
+        )
+        doctor_label = MDLabel(
+            text="Medical Professional",
+            font_style="H6",
+            theme_text_color="Primary"
+        )
+        doctor_option.add_widget(self.doctor_check)
+        doctor_option.add_widget(doctor_label)
+        
+        # Patient option
+        patient_option = MDBoxLayout(
+            orientation="horizontal",
+            spacing=dp(15),
+            size_hint_y=None,
+            height=dp(50)
+        )
+        self.patient_check = MDCheckbox(
+            group="role",
+            size_hint=(None, None),
+            size=(dp(30), dp(30))
+        )
+        patient_label = MDLabel(
+            text="Patient",
+            font_style="H6",
+            theme_text_color="Primary"
+        )
+        patient_option.add_widget(self.patient_check)
+        patient_option.add_widget(patient_label)
+        
+        role_options.add_widget(doctor_option)
+        role_options.add_widget(patient_option)
+        role_card.add_widget(role_options)
+        
+        # Continue button
+        continue_btn = MDRaisedButton(
+            text="Continue to Sign In",
+            pos_hint={"center_x": 0.5},
+            size_hint=(None, None),
+            size=(dp(220), dp(50)),
+            md_bg_color=[0.07, 0.45, 0.87, 1]
+        )
+        continue_btn.bind(on_release=self.proceed_to_login)
+        role_card.add_widget(continue_btn)
+        
+        content.add_widget(role_card)
+        main_layout.add_widget(content)
+        
+        self.add_widget(main_layout)
+
+    def proceed_to_login(self, instance):
+        if self.doctor_check.active:
+            self.manager.get_screen("professional_login").role = "doctor"
+            self.manager.current = "professional_login"
+        elif self.patient_check.active:
+            self.manager.get_screen("professional_login").role = "patient"
+            self.manager.current = "professional_login"
+        else:
+            dialog = MDDialog(
+                title="Selection Required",
+                text="Please select your role to continue.",
+                buttons=[
+                    MDFlatButton(
+                        text="OK",
+                        theme_text_color="Custom",
+                        text_color=[0.07, 0.45, 0.87, 1]
+                    )
+                ]
+            )
+            dialog.open()
+
+class ProfessionalLoginScreen(Screen):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.role = None
+        
+        main_layout = MDBoxLayout(
+            orientation="vertical",
+            padding=0,
+            spacing=0,
+            md_bg_color=[0.98, 0.98, 0.98, 1]
+        )
+        
+        # Top App Bar
+        top_bar = MDTopAppBar(
+            title="Sign In",
+            elevation=4,
+            md_bg_color=[0.07, 0.45, 0.87, 1],
+            specific_text_color=[1, 1, 1, 1],
+            left_action_items=[["arrow-left", lambda x: self.go_back()]]
+        )
+        main_layout.add_widget(top_bar)
+        
+        # Login form container
+        form_container = MDBoxLayout(
+            orientation="vertical",
+            padding=[dp(40), dp(20), dp(40), dp(40)],
+            spacing=dp(30)
+        )
+        
+        # Role indicator
+        self.role_indicator = MDLabel(
+            text="",
+            halign="center",
+            font_style="H5",
+            theme_text_color="Primary",
+            size_hint_y=None,
+            height=dp(40)
+        )
+        form_container.add_widget(self.role_indicator)
+        
+        # Login card
+        login_card = MDCard(
+            orientation="vertical",
+            padding=dp(30),
+            size_hint_y=None,
+            height=dp(320),
+            elevation=6,
+            radius=[dp(12),],
+            md_bg_color=[1, 1, 1, 1]
+        )
+        
+        # Form fields
+        self.username_field = MDTextField(
+            hint_text="Username",
+            icon_left="account",
+            size_hint_y=None,
+            height=dp(60)
+        )
+        
+        self.password_field = MDTextField(
+            hint_text="Password",
+            icon_left="key",
+            password=True,
+            size_hint_y=None,
+            height=dp(60)
+        )
+        
+        login_card.add_widget(self.username_field)
+        login_card.add_widget(self.password_field)
+        
+        # Sign in button
+        signin_btn = MDRaisedButton(
+            text="Sign In",
+            pos_hint={"center_x": 0.5},
+            size_hint=(None, None),
+            size=(dp(200), dp(50)),
+            md_bg_color=[0.07, 0.45, 0.87, 1]
+        )
+        signin_btn.bind(on_release=self.authenticate)
+        login_card.add_widget(signin_btn)
+        
+        form_container.add_widget(login_card)
+        main_layout.add_widget(form_container)
+        
+        self.add_widget(main_layout)
+    
+    def go_back(self):
+        self.manager.current = "professional_role"
+    
+    def on_enter(self):
+        role_text = "Medical Professional" if self.role == "doctor" else "Patient"
+        self.role_indicator.text = f"Sign In as {role_text}"
+    
+    def authenticate(self, instance):
+        username = self.username_field.text.strip()
+        password = self.password_field.text.strip()
+        
+        if self.role == "doctor" and username == "doctor" and password == "123":
+            self.manager.current = "professional_doctor_dashboard"
+        elif self.role == "patient" and username == "patient" and password == "123":
+            self.manager.current = "professional_patient_dashboard"
+        else:
+            dialog = MDDialog(
+                title="Authentication Failed",
+                text="Invalid credentials. Please check your username and password.",
+                buttons=[
+                    MDFlatButton(
+                        text="OK",
+                        theme_text_color="Custom",
+                        text_color=[0.07, 0.45, 0.87, 1]
+                    )
+                ]
+            )
+            dialog.open()
+
+class ProfessionalDoctorDashboard(Screen):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        
+        main_layout = MDBoxLayout(orientation="vertical")
+        
+        # Top App Bar
+        self.top_bar = MDTopAppBar(
+            title="Medical Dashboard",
+            elevation=4,
+            md_bg_color=[0.07, 0.45, 0.87, 1],
+            specific_text_color=[1, 1, 1, 1],
+            right_action_items=[["logout", lambda x: self.logout()]]
+        )
+        main_layout.add_widget(self.top_bar)
+        
+        # Content area
+        content_scroll = MDScrollView()
+        content_layout = MDBoxLayout(
+            orientation="vertical",
+            padding=[dp(20), dp(10), dp(20), dp(20)],
+            spacing=dp(25),
+            size_hint_y=None
+        )
+        content_layout.bind(minimum_height=content_layout.setter('height'))
+        
+        # Welcome section
+        welcome_card = MDCard(
+            orientation="vertical",
+            padding=dp(25),
+            size_hint_y=None,
+            height=dp(140),
+            elevation=4,
+            radius=[dp(12),],
+            md_bg_color=[0.95, 0.97, 1, 1]
+        )
+        
+        welcome_card.add_widget(MDLabel(
+            text="Welcome, Dr. Smith",
+            font_style="H5",
+            theme_text_color="Primary",
+            bold=True
+        ))
+        welcome_card.add_widget(MDLabel(
+            text="AI-Powered Medical Analysis Platform",
+            theme_text_color="Secondary"
+        ))
+        content_layout.add_widget(welcome_card)
+        
+        # Upload section
+        upload_card = MDCard(
+            orientation="vertical",
+            padding=dp(25),
+            size_hint_y=None,
+            height=dp(280),
+            elevation=4,
+            radius=[dp(12),]
+        )
+        
+        upload_card.add_widget(MDLabel(
+            text="Medical Document Analysis",
+            font_style="H6",
+            theme_text_color="Primary",
+            size_hint_y=None,
+            height=dp(30)
+        ))
+        
+        upload_card.add_widget(MDLabel(
+            text="Upload patient PDF reports for AI-powered analysis and insights",
+            theme_text_color="Secondary",
+            size_hint_y=None,
+            height=dp(40)
+        ))
+        
+        # Upload button
+        upload_btn = MDRaisedButton(
+            text="Upload Medical Report",
+            pos_hint={"center_x": 0.5},
+            size_hint=(None, None),
+            size=(dp(220), dp(50)),
+            md_bg_color=[0.07, 0.45, 0.87, 1]
+        )
+        upload_btn.bind(on_release=self.analyze_pdf)
+        upload_card.add_widget(upload_btn)
+        
+        # Cancel button for the running analysis
+        cancel_btn = MDFlatButton(
+            text="Cancel Analysis",
+            pos_hint={"center_x": 0.5},
+            theme_text_color="Custom",
+            text_color=[0.07, 0.45, 0.87, 1]
+        )
+        cancel_btn.bind(on_release=self.cancel_analysis)
+        upload_card.add_widget(cancel_btn)
+        
+        content_layout.add_widget(upload_card)
+        
+        # Results section
+        self.results_card = MDCard(
+            orientation="vertical",
+            padding=dp(25),
+            size_hint_y=None,
+            height=dp(200),
+            elevation=4,
+            radius=[dp(12),],
+            md_bg_color=[0.98, 0.98, 0.98, 1]
+        )
+        
+        self.results_card.add_widget(MDLabel(
+            text="Analysis Results",
+            font_style="H6",
+            theme_text_color="Primary",
+            size_hint_y=None,
+            height=dp(30)
+        ))
+        
+        self.results_label = MDLabel(
+            text="Upload a medical report to view AI analysis results",
+            theme_text_color="Secondary",
+            size_hint_y=None,
+            height=dp(120)
+        )
+        self.results_card.add_widget(self.results_label)
+        
+        content_layout.add_widget(self.results_card)
+        content_scroll.add_widget(content_layout)
+        main_layout.add_widget(content_scroll)
+        
+        self.add_widget(main_layout)
+        
+        # Analysis runs on a worker thread; callbacks come back through the Clock
+        self.analysis_executor = AnalysisExecutor(
+            dispatch=lambda fn: Clock.schedule_once(lambda dt: fn())
+        )
+        self.active_jobs = []
+    
+    def logout(self):
+        self.manager.current = "professional_role"
+    
+    def analyze_pdf(self, instance):
+        file_path = filechooser.open_file(
+            title="Select Medical Report",
+            filters=[("PDF Files", "*.pdf")]
+        )
+        if file_path:
+            try:
+                job = self.analysis_executor.submit(
+                    file_path[0],
+                    on_progress=self.on_analysis_progress,
+                    on_done=self.on_analysis_done,
+                    on_error=self.on_analysis_error,
+                    on_cancelled=self.on_analysis_cancelled
+                )
+                self.active_jobs.append(job)
+                ahead = len(self.active_jobs) - 1
+                if ahead:
+                    self.results_label.text = f"⏳ Report queued ({ahead} ahead of it)..."
+                else:
+                    self.results_label.text = "🔬 Analyzing medical report...\nPlease wait, this may take a moment."
+            except Exception as e:
+                self.results_label.text = f"❌ Error: {str(e)}"
+    
+    def cancel_analysis(self, instance):
+        # Cancel the oldest job; anything queued behind it keeps its place
+        if self.active_jobs:
+            self.active_jobs[0].cancel()
+            self.results_label.text = "⏹ Cancelling analysis..."
+    
+    def on_analysis_progress(self, job, stage, current, total):
+        message = ANALYSIS_STAGE_TEXT.get(stage, stage).format(current=current, total=total)
+        self.results_label.text = f"🔬 Analyzing medical report...\n{message}"
+    
+    def on_analysis_done(self, job, analysis_result):
+        self._forget_job(job)
+        self.process_pdf_analysis(analysis_result)
+    
+    def on_analysis_error(self, job, error):
+        self._forget_job(job)
+        self.results_label.text = f"❌ Analysis Failed:\n{str(error)}"
+    
+    def on_analysis_cancelled(self, job):
+        self._forget_job(job)
+        self.results_label.text = "Analysis cancelled"
+    
+    def _forget_job(self, job):
+        if job in self.active_jobs:
+            self.active_jobs.remove(job)
+    
+    def process_pdf_analysis(self, analysis_result):
+        self.results_label.text = analysis_result
+        # Auto-adjust height based on content length
+        line_count = analysis_result.count('\n') + 1
+        self.results_card.height = max(dp(300), dp(50) * line_count)
+
+class ProfessionalPatientDashboard(Screen):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        
+        main_layout = MDBoxLayout(orientation="vertical")
+        
+        # Top App Bar
+        self.top_bar = MDTopAppBar(
+            title="Patient Portal",
+            elevation=4,
+            md_bg_color=[0.07, 0.45, 0.87, 1],
+            specific_text_color=[1, 1, 1, 1],
+            right_action_items=[["logout", lambda x: self.logout()]]
+        )
+        main_layout.add_widget(self.top_bar)
+        
+        # Content area
+        content_scroll = MDScrollView()
+        content_layout = MDBoxLayout(
+            orientation="vertical",
+            padding=[dp(20), dp(10), dp(20), dp(20)],
+            spacing=dp(25),
+            size_hint_y=None
+        )
+        content_layout.bind(minimum_height=content_layout.setter('height'))
+        
+        # Welcome section
+        welcome_card = MDCard(
+            orientation="vertical",
+            padding=dp(25),
+            size_hint_y=None,
+            height=dp(140),
+            elevation=4,
+            radius=[dp(12),],
+            md_bg_color=[0.95, 0.97, 1, 1]
+        )
+        
+        welcome_card.add_widget(MDLabel(
+            text="Find Your Specialist",
+            font_style="H5",
+            theme_text_color="Primary",
+            bold=True
+        ))
+        welcome_card.add_widget(MDLabel(
+            text="Connect with the right medical professionals for your needs",
+            theme_text_color="Secondary"
+        ))
+        content_layout.add_widget(welcome_card)
+        
+        # Search form
+        search_card = MDCard(
+            orientation="vertical",
+            padding=dp(25),
+            size_hint_y=None,
+            height=dp(320),
+            elevation=4,
+            radius=[dp(12),]
+        )
+        
+        search_card.add_widget(MDLabel(
+            text="Specialist Search",
+            font_style="H6",
+            theme_text_color="Primary",
+            size_hint_y=None,
+            height=dp(30)
+        ))
+        
+        self.condition_input = MDTextField(
+            hint_text="Enter medical condition or symptoms",
+            icon_left="stethoscope",
+            size_hint_y=None,
+            height=dp(60)
+        )
+        
+        self.location_input = MDTextField(
+            hint_text="Preferred location (optional)",
+            icon_left="map-marker",
+            size_hint_y=None,
+            height=dp(60)
+        )
+        
+        # Suggestion rows under each field, refreshed after typing pauses
+        self.condition_suggestions = MDBoxLayout(
+            orientation="horizontal",
+            spacing=dp(5),
+            size_hint_y=None,
+            height=dp(36)
+        )
+        self.location_suggestions = MDBoxLayout(
+            orientation="horizontal",
+            spacing=dp(5),
+            size_hint_y=None,
+            height=dp(36)
+        )
+        self.condition_typeahead = Clock.create_trigger(
+            lambda dt: self.show_suggestions(self.condition_input, self.condition_suggestions, suggest_conditions),
+            TYPEAHEAD_DEBOUNCE
+        )
+        self.location_typeahead = Clock.create_trigger(
+            lambda dt: self.show_suggestions(self.location_input, self.location_suggestions, suggest_locations),
+            TYPEAHEAD_DEBOUNCE
+        )
+        self.condition_input.bind(text=lambda field, text: self.debounce(self.condition_typeahead))
+        self.location_input.bind(text=lambda field, text: self.debounce(self.location_typeahead))
+        
+        search_card.add_widget(self.condition_input)
+        search_card.add_widget(self.condition_suggestions)
+        search_card.add_widget(self.location_input)
+        search_card.add_widget(self.location_suggestions)
+        
+        # Search button
+        search_btn = MDRaisedButton(
+            text="Find Specialists",
+            pos_hint={"center_x": 0.5},
+            size_hint=(None, None),
+            size=(dp(200), dp(50)),
+            md_bg_color=[0.07, 0.45, 0.87, 1]
+        )
+        search_btn.bind(on_release=self.search_specialists)
+        search_card.add_widget(search_btn)
+        
+        content_layout.add_widget(search_card)
+        content_scroll.add_widget(content_layout)
+        main_layout.add_widget(content_scroll)
+        
+        self.add_widget(main_layout)
+    
+    def logout(self):
+        self.manager.current = "professional_role"
+    
+    def debounce(self, trigger):
+        # Restart the countdown so lookups only run once typing pauses
+        trigger.cancel()
+        trigger()
+    
+    def show_suggestions(self, field, row, suggest):
+        row.clear_widgets()
+        text = field.text.strip()
+        suggestions = suggest(text, TYPEAHEAD_SUGGESTIONS)
+        if suggestions == [text]:
+            return
+        for suggestion in suggestions:
+            chip = MDFlatButton(
+                text=suggestion,
+                theme_text_color="Custom",
+                text_color=[0.07, 0.45, 0.87, 1]
+            )
+            chip.bind(on_release=lambda btn, field=field: setattr(field, "text", btn.text))
+            row.add_widget(chip)
+    
+    def search_specialists(self, instance):
+        condition = self.condition_input.text.strip()
+        location = self.location_input.text.strip()
+        
+        if condition:
+            self.manager.get_screen("professional_results").update_results(condition, location)
+            self.manager.current = "professional_results"
+        else:
+            dialog = MDDialog(
+                title="Search Required",
+                text="Please enter a medical condition or symptoms to search.",
+                buttons=[
+                    MDFlatButton(
+                        text="OK",
+                        theme_text_color="Custom",
+                        text_color=[0.07, 0.45, 0.87, 1]
+                    )
+                ]
+            )
+            dialog.open()
+
+def doctor_row(doctor):
+    # Plain display strings for one DoctorCard
+    return {
+        "name_text": f"Dr. {doctor['Name']}",
+        "rating_text": f"⭐ {doctor['Rating']}",
+        "location_text": f"📍 {doctor['Location']}",
+        "specialist_text": f"🎯 {doctor['Specialist']}",
+        "experience_text": f"💼 {doctor['Experience']} years experience",
+        "contact_text": f"📞 {doctor['Contact']}",
+    }
+
+class DoctorCard(RecycleDataViewBehavior, MDCard):
+    name_text = StringProperty("")
+    rating_text = StringProperty("")
+    location_text = StringProperty("")
+    specialist_text = StringProperty("")
+    experience_text = StringProperty("")
+    contact_text = StringProperty("")
+    
+    def __init__(self, **kwargs):
+        super().__init__(
+            orientation="vertical",
+            padding=dp(20),
+            elevation=4,
+            radius=[dp(10),],
+            **kwargs
+        )
+        
+        # Doctor header with rating
+        header_layout = MDBoxLayout(
+            orientation="horizontal",
+            size_hint_y=None,
+            height=dp(40)
+        )
+        
+        name_label = MDLabel(
+            font_style="H6",
+            theme_text_color="Primary",
+            size_hint_x=0.7
+        )
+        
+        rating_label = MDLabel(
+            theme_text_color="Secondary",
+            size_hint_x=0.3,
+            halign="right"
+        )
+        
+        header_layout.add_widget(name_label)
+        header_layout.add_widget(rating_label)
+        self.add_widget(header_layout)
+        
+        # Doctor details
+        location_label = MDLabel(theme_text_color="Secondary")
+        specialist_label = MDLabel(theme_text_color="Secondary")
+        experience_label = MDLabel(theme_text_color="Secondary")
+        contact_label = MDLabel(theme_text_color="Secondary")
+        for label in (location_label, specialist_label, experience_label, contact_label):
+            self.add_widget(label)
+        
+        # Recycled cards only get new text when they scroll into view
+        self.bind(
+            name_text=name_label.setter("text"),
+            rating_text=rating_label.setter("text"),
+            location_text=location_label.setter("text"),
+            specialist_text=specialist_label.setter("text"),
+            experience_text=experience_label.setter("text"),
+            contact_text=contact_label.setter("text")
+        )
+
+class ProfessionalResultsScreen(Screen):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        
+        main_layout = MDBoxLayout(orientation="vertical")
+        
+        # Top App Bar
+        self.top_bar = MDTopAppBar(
+            title="Specialist Results",
+            elevation=4,
+            md_bg_color=[0.07, 0.45, 0.87, 1],
+            specific_text_color=[1, 1, 1, 1],
+            left_action_items=[["arrow-left", lambda x: self.go_back()]]
+        )
+        main_layout.add_widget(self.top_bar)
+        
+        # Results header: recommendation, match count and error cards
+        self.results_layout = MDBoxLayout(
+            orientation="vertical",
+            padding=[dp(20), dp(10), dp(20), 0],
+            spacing=dp(20),
+            size_hint_y=None
+        )
+        self.results_layout.bind(minimum_height=self.results_layout.setter('height'))
+        main_layout.add_widget(self.results_layout)
+        
+        # Doctor list: only the cards in view exist, recycled while scrolling
+        self.doctor_list = RecycleView(viewclass=DoctorCard)
+        doctor_list_layout = RecycleBoxLayout(
+            orientation="vertical",
+            padding=[dp(20), dp(20), dp(20), dp(20)],
+            spacing=dp(20),
+            default_size=(None, dp(180)),
+            default_size_hint=(1, None),
+            size_hint_y=None
+        )
+        doctor_list_layout.bind(minimum_height=doctor_list_layout.setter('height'))
+        self.doctor_list.add_widget(doctor_list_layout)
+        self.doctor_list.bind(scroll_y=lambda *args: self.load_more_if_needed())
+        main_layout.add_widget(self.doctor_list)
+        
+        self.search = None
+        self.next_cursor = None
+        
+        self.add_widget(main_layout)
+    
+    def go_back(self):
+        self.manager.current = "professional_patient_dashboard"
+    
+    def add_page(self, page):
+        self.doctor_list.data.extend(doctor_row(doctor) for doctor in page.doctors.to_dict(orient="records"))
+        self.next_cursor = page.next_cursor
+        # A short page may not fill the view, leaving nothing to scroll
+        Clock.schedule_once(lambda dt: self.load_more_if_needed())
+    
+    def load_more_if_needed(self):
+        if not self.next_cursor:
+            return
+        hidden = self.doctor_list.children[0].height - self.doctor_list.height
+        # Fetch the next page while at least a screenful is still left to scroll
+        if hidden > 0 and self.doctor_list.scroll_y * hidden > self.doctor_list.height:
+            return
+        specialist, filters = self.search
+        self.add_page(ranked_search(specialist, cursor=self.next_cursor, **filters))
+    
+    def update_results(self, condition, location):
+        self.results_layout.clear_widgets()
+        self.doctor_list.data = []
+        self.doctor_list.scroll_y = 1
+        self.next_cursor = None
+        
+        # Repeated searches come straight from the result cache; only
+        # doctors within reach of the requested city are listed, nearest
+        # ranking higher
+        filters = dict(
+            location=location,
+            min_experience=2,
+            min_rating=3.5,
+            page_size=RESULTS_PAGE_SIZE,
+            nearby_only=True
+        )
+        match, page = search_doctors(condition, **filters)
+        specialist = match[1] if match else None
+        
+        if specialist:
+            disease, _, score = match
+            # Specialist recommendation card
+            specialist_card = MDCard(
+                orientation="vertical",
+                padding=dp(25),
+                size_hint_y=None,
+                height=dp(120),
+                elevation=4,
+                radius=[dp(12),],
+                md_bg_color=[0.95, 0.97, 1, 1]
+            )
+            
+            specialist_card.add_widget(MDLabel(
+                text="Recommended Specialist",
+                font_style="H6",
+                theme_text_color="Primary"
+            ))
+            specialist_card.add_widget(MDLabel(
+                text=f"{specialist}",
+                font_style="H5",
+                theme_text_color="Primary",
+                bold=True
+            ))
+            if score < 1.0:
+                # Typo-tolerant match; say what the input was read as
+                specialist_card.add_widget(MDLabel(
+                    text=f"Showing results for {disease}",
+                    theme_text_color="Secondary"
+                ))
+            self.results_layout.add_widget(specialist_card)
+            
+            # Best-ranked matching doctors, one page at a time
+            self.search = (specialist, filters)
+            if page.total:
+                results_info = MDLabel(
+                    text=f"Found {page.total} specialist(s) matching your criteria",
+                    theme_text_color="Secondary",
+                    size_hint_y=None,
+                    height=dp(40)
+                )
+                self.results_layout.add_widget(results_info)
+                self.add_page(page)
+            else:
+                no_results_card = MDCard(
+                    orientation="vertical",
+                    padding=dp(30),
+                    size_hint_y=None,
+                    height=dp(120),
+                    elevation=2,
+                    radius=[dp(10),]
+                )
+                no_results_card.add_widget(MDLabel(
+                    text="No specialists found",
+                    theme_text_color="Secondary",
+                    halign="center",
+                    font_style="H6"
+                ))
+                no_results_card.add_widget(MDLabel(
+                    text="Try adjusting your search criteria or location",
+                    theme_text_color="Secondary",
+                    halign="center"
+                ))
+                self.results_layout.add_widget(no_results_card)
+        else:
+            error_card = MDCard(
+                orientation="vertical",
+                padding=dp(30),
+                size_hint_y=None,
+                height=dp(120),
+                elevation=2,
+                radius=[dp(10),]
+            )
+            error_card.add_widget(MDLabel(
+                text="Condition not recognized",
+                theme_text_color="Error",
+                halign="center",
+                font_style="H6"
+            ))
+            suggestions = match_conditions(condition, k=3, min_score=0.3)
+            if suggestions:
+                hint = "Did you mean: " + ", ".join(disease for (disease, _), _ in suggestions) + "?"
+            else:
+                hint = "Please check your input or try different symptoms"
+            error_card.add_widget(MDLabel(
+                text=hint,
+                theme_text_color="Secondary",
+                halign="center"
+            ))
+            self.results_layout.add_widget(error_card)
+
+class ProfessionalApp(MDApp):
+    def build(self):
+        self.theme_cls.primary_palette = "Blue"
+        self.theme_cls.theme_style = "Light"
+        self.theme_cls.primary_hue = "500"
+        
+        sm = ScreenManager()
+        sm.add_widget(ProfessionalRoleScreen(name="professional_role"))
+        sm.add_widget(ProfessionalLoginScreen(name="professional_login"))
+        sm.add_widget(ProfessionalDoctorDashboard(name="professional_doctor_dashboard"))
+        sm.add_widget(ProfessionalPatientDashboard(name="professional_patient_dashboard"))
+        sm.add_widget(ProfessionalResultsScreen(name="professional_results"))
+        
+        return sm
+    
+    def on_start(self):
+        Clock.schedule_once(self.on_first_frame)
+    
+    def on_first_frame(self, dt):
+        Logger.info(f"DocWise: first frame after {time.perf_counter() - APP_START:.2f}s")
+        # The role screen is now on screen, so loading can start without delaying it
+        if WARM_UP_MODELS:
+            pdf_analyzer.warm_up(background=True)
+        # Typo-tolerant search needs scikit-learn; keep its import off the UI thread
+        disease_mapper.warm_up(background=True)
+        # Pick up doctor onboarding edits to the CSV without a restart
+        start_watcher()
@@ -0,0 +1,182 @@
+# batch_analyze.py
+#
+# Headless bulk analysis of archived reports, e.g.
+#     python batch_analyze.py /archive/reports --output results.jsonl --workers 4
+#     python batch_analyze.py manifest.txt --output results.jsonl
+#
+# Each worker process loads the models once. Results are appended to the
+# JSONL output as they finish, so re-running the same command resumes
+# where an interrupted run stopped.
+
+import argparse
+import json
+import os
+import statistics
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from modules import pdf_analyzer
+
+def find_pdfs(source):
+    """PDF paths under a directory, or listed one per line in a manifest file"""
+    if os.path.isdir(source):
+        paths = []
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            paths.extend(os.path.join(root, name) for name in sorted(files)
+                         if name.lower().endswith(".pdf"))
+        return paths
+    with open(source, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+def load_done(output_path):
+    """Paths already recorded in the output; errors are retried, torn lines ignored"""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("status") != "error":
+                done.add(record["path"])
+    return done
+
+def _end_torn_line(output_path):
+    # An interrupted write can leave half a line; start the next record on a fresh one
+    if os.path.exists(output_path) and os.path.getsize(output_path):
+        with open(output_path, "rb+") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+
+# Each worker holds its own copy of BART and spaCy, so more workers cost
+# memory as well as cores
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+_use_cache = True
+
+def _init_worker(use_cache, torch_threads):
+    global _use_cache
+    _use_cache = use_cache
+    # The pool already spreads reports over the cores; no nested extraction
+    # pools, and torch gets only this worker's share of the cores
+    pdf_analyzer.EXTRACTION_WORKERS = 1
+    import torch
+    torch.set_num_threads(torch_threads)
+    pdf_analyzer.warm_up(background=False)
+
+def _analyze(path):
+    events = []
+
+    def progress(stage, current=None, total=None):
+        events.append((stage, time.perf_counter()))
+
+    start = time.perf_counter()
+    cache_before = pdf_analyzer.chunk_summary_cache.stats()
+    record = {"path": path}
+    try:
+        with open(path, "rb") as f:
+            file_bytes = f.read()
+        if _use_cache:
+            result = pdf_analyzer.analysis_cache.get_or_compute(
+                pdf_analyzer.analysis_cache_key(file_bytes),
+                lambda: pdf_analyzer.analyze_report(file_bytes, progress),
+                cacheable=pdf_analyzer.is_cacheable_result
+            )
+        else:
+            result = pdf_analyzer.analyze_report(file_bytes, progress)
+        record.update(result)
+    except Exception as e:
+        record.update(status="error", error=str(e))
+    end = time.perf_counter()
+
+    # Time spent in each stage, from one stage start to the next
+    stages = {}
+    for (stage, began), (_, finished) in zip(events, events[1:] + [(None, end)]):
+        stages[stage] = stages.get(stage, 0.0) + finished - began
+    record["seconds"] = end - start
+    cache_after = pdf_analyzer.chunk_summary_cache.stats()
+    record["chunk_cache"] = {field: cache_after[field] - cache_before[field] for field in ("hits", "misses")}
+    record["stage_seconds"] = stages
+    return record
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def print_report(records, skipped, wall_seconds):
+    statuses = {}
+    for record in records:
+        statuses[record["status"]] = statuses.get(record["status"], 0) + 1
+    print(f"\nProcessed {len(records)} report(s) in {wall_seconds:.1f}s "
+          f"({len(records) / wall_seconds if wall_seconds else 0:.2f} reports/s), "
+          f"skipped {skipped} already done")
+    print("Status: " + ", ".join(f"{status}={count}" for status, count in sorted(statuses.items())))
+
+    hits = sum(record["chunk_cache"]["hits"] for record in records)
+    misses = sum(record["chunk_cache"]["misses"] for record in records)
+    if hits + misses:
+        print(f"Chunk summaries: {hits} from cache, {misses} summarized "
+              f"(hit rate {hits / (hits + misses):.0%})")
+
+    stage_times = {"total": [record["seconds"] for record in records]}
+    for record in records:
+        for stage, seconds in record["stage_seconds"].items():
+            stage_times.setdefault(stage, []).append(seconds)
+    print(f"\n{'stage':<12} {'count':>6} {'mean s':>8} {'p50 s':>8} {'p95 s':>8}")
+    for stage, values in stage_times.items():
+        if values:
+            print(f"{stage:<12} {len(values):>6} {statistics.mean(values):>8.2f} "
+                  f"{_percentile(values, 0.5):>8.2f} {_percentile(values, 0.95):>8.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze a directory or manifest of PDF reports")
+    parser.add_argument("source", help="directory to walk, or a text file with one PDF path per line")
+    parser.add_argument("--output", default="analysis_results.jsonl")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="worker processes, each loading its own models (default: %(default)s)")
+    parser.add_argument("--no-cache", action="store_true", help="ignore the on-disk analysis cache")
+    args = parser.parse_args()
+
+    paths = find_pdfs(args.source)
+    done = load_done(args.output)
+    todo = [path for path in paths if path not in done]
+    torch_threads = max(1, (os.cpu_count() or 1) // max(1, args.workers))
+    print(f"{len(paths)} report(s) found, {len(todo)} to analyze with {args.workers} worker(s), "
+          f"{torch_threads} torch thread(s) each")
+
+    _end_torn_line(args.output)
+    records = []
+    start = time.perf_counter()
+    with open(args.output, "a", encoding="utf-8") as out, \
+            ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                                initargs=(not args.no_cache, torch_threads)) as pool:
+        # Keep a bounded number of reports in flight rather than queueing all of them
+        pending = set()
+        queue = iter(todo)
+        try:
+            while True:
+                for path in queue:
+                    pending.add(pool.submit(_analyze, path))
+                    if len(pending) >= args.workers * 2:
+                        break
+                if not pending:
+                    break
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    record = future.result()
+                    out.write(json.dumps(record) + "\n")
+                    out.flush()
+                    records.append(record)
+                    print(f"[{len(records)}/{len(todo)}] {record['status']:<11} {record['path']}")
+        except KeyboardInterrupt:
+            print("Interrupted; re-run the same command to resume")
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    print_report(records, len(paths) - len(todo), time.perf_counter() - start)
+
+if __name__ == "__main__":
+    main()
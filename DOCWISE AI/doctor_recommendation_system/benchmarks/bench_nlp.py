@@ -0,0 +1,83 @@
+# benchmarks/bench_nlp.py
+#
+# Per-document latency and memory of symptom extraction for each NLP mode.
+# Every mode runs in a fresh interpreter so load time and RSS are not shared.
+# Run from doctor_recommendation_system/:
+#     python -m benchmarks.bench_nlp --docs 200
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from benchmarks.bench_summarization import SAMPLE_PARAGRAPH
+
+def _max_rss_mb():
+    if resource is None:
+        return float("nan")
+    # ru_maxrss is in KiB on Linux (bytes on macOS; close enough for a comparison)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def run_mode(mode, docs, batch_size):
+    from modules import pdf_analyzer
+
+    texts = [SAMPLE_PARAGRAPH * 8] * docs
+    baseline_rss = _max_rss_mb()
+
+    pdf_analyzer.set_nlp_mode(mode)
+    start = time.perf_counter()
+    pdf_analyzer.nlp_model.get()
+    load_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for text in texts:
+        pdf_analyzer.extract_symptoms(text)
+    single_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pdf_analyzer.extract_symptoms_batch(texts, batch_size=batch_size)
+    batch_seconds = time.perf_counter() - start
+
+    return {
+        "mode": mode,
+        "load_s": load_seconds,
+        "per_doc_ms": single_seconds / docs * 1000,
+        "batched_per_doc_ms": batch_seconds / docs * 1000,
+        "rss_mb": _max_rss_mb() - baseline_rss,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark spaCy modes for symptom extraction")
+    parser.add_argument("--docs", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--modes", nargs="+", default=["full", "senter", "rule"])
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_mode(args.worker, args.docs, args.batch_size)))
+        return
+
+    print(f"{'mode':<8} {'load s':>8} {'ms/doc':>8} {'pipe ms/doc':>12} {'RSS MB':>8}")
+    for mode in args.modes:
+        proc = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_nlp", "--worker", mode,
+             "--docs", str(args.docs), "--batch-size", str(args.batch_size)],
+            capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "failed"
+            print(f"{mode:<8} {error}")
+            continue
+        row = json.loads(proc.stdout.strip().splitlines()[-1])
+        print(f"{row['mode']:<8} {row['load_s']:>8.2f} {row['per_doc_ms']:>8.2f} "
+              f"{row['batched_per_doc_ms']:>12.2f} {row['rss_mb']:>8.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# modules/analysis_worker.py
+
+import itertools
+import queue
+import threading
+
+from modules import pdf_analyzer
+
+
+class AnalysisJob:
+    """A queued PDF analysis; cancel() is safe to call from any thread"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, file_path, on_progress=None, on_done=None, on_error=None, on_cancelled=None):
+        self.id = next(self._ids)
+        self.file_path = file_path
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_cancelled = on_cancelled
+        self.cancel_event = threading.Event()
+        self.state = "queued"
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+
+class AnalysisExecutor:
+    """Runs summarize_pdf jobs one at a time on a background thread.
+
+    Callbacks are handed to ``dispatch`` so the UI can hop back onto its
+    own thread (app_ui.py passes a Clock.schedule_once wrapper). New uploads
+    wait in the queue while an earlier job is still running.
+    """
+
+    def __init__(self, dispatch=None, analyze=None):
+        self._dispatch = dispatch or (lambda fn: fn())
+        self._analyze = analyze or pdf_analyzer.summarize_pdf
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._thread = None
+
+    def submit(self, file_path, on_progress=None, on_done=None, on_error=None, on_cancelled=None):
+        job = AnalysisJob(file_path, on_progress, on_done, on_error, on_cancelled)
+        with self._lock:
+            self._pending += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="pdf-analysis", daemon=True)
+                self._thread.start()
+        self._queue.put(job)
+        return job
+
+    def pending_count(self):
+        """Number of jobs queued or running"""
+        with self._lock:
+            return self._pending
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                self._process(job)
+            finally:
+                with self._lock:
+                    self._pending -= 1
+
+    def _process(self, job):
+        if job.cancelled:
+            self._finish(job, "cancelled", job.on_cancelled)
+            return
+
+        job.state = "running"
+
+        def progress(stage, current=None, total=None):
+            if job.on_progress and not job.cancelled:
+                self._dispatch(lambda: job.on_progress(job, stage, current, total))
+
+        try:
+            result = self._analyze(job.file_path, progress=progress, cancel_event=job.cancel_event)
+        except pdf_analyzer.AnalysisCancelled:
+            self._finish(job, "cancelled", job.on_cancelled)
+        except Exception as e:
+            self._finish(job, "failed", job.on_error, e)
+        else:
+            self._finish(job, "done", job.on_done, result)
+
+    def _finish(self, job, state, callback, *args):
+        job.state = state
+        if callback:
+            self._dispatch(lambda: callback(job, *args))
@@ -0,0 +1,51 @@
+# modules/condition_matcher.py
+
+import numpy as np
+
+# N-grams found in more than this share of the names are left out of the
+# index; they say little about a name and would make every posting list long
+MAX_NGRAM_SHARE = 0.2
+
+class FuzzyConditionMatcher:
+    """Typo-tolerant lookup over condition names with a character n-gram TF-IDF index
+
+    Every known name (diseases, aliases, variants) becomes an L2-normalized
+    TF-IDF vector of its character 2-3 grams. The matrix is kept
+    column-major, so a query only reads the posting lists of its own
+    n-grams and skips names sharing none of them. Common n-grams ("er",
+    " a") are not indexed, so no posting list covers more than
+    MAX_NGRAM_SHARE of the names. Scores are cosine similarities in [0, 1].
+    """
+
+    def __init__(self, names, targets):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        self.targets = list(targets)
+        self.vectorizer = TfidfVectorizer(analyzer="char_wb", ngram_range=(2, 3), max_df=MAX_NGRAM_SHARE)
+        self._postings = self.vectorizer.fit_transform(names).tocsc()
+
+    def match(self, query, k=5, min_score=0.0):
+        """Best ``k`` distinct targets for query as (target, score), best first"""
+        query_vector = self.vectorizer.transform([query])
+        if not query_vector.nnz:
+            return []
+        columns = self._postings[:, query_vector.indices]
+        # Accumulate weight per row straight from the posting lists
+        weights = columns.data * np.repeat(query_vector.data, np.diff(columns.indptr))
+        rows, inverse = np.unique(columns.indices, return_inverse=True)
+        scores = np.bincount(inverse, weights=weights)
+
+        order = np.argsort(-scores, kind="stable")
+        results = []
+        seen = set()
+        for i in order:
+            if scores[i] < min_score:
+                break
+            target = self.targets[rows[i]]
+            if target in seen:
+                continue
+            seen.add(target)
+            results.append((target, float(scores[i])))
+            if len(results) == k:
+                break
+        return results
@@ -1,25 +1,171 @@
-import pandas as pd
 import os
+import re
+import threading
+
+from modules.snapshot import load_table
 
 # Get absolute path of the CSV
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 CSV_PATH = os.path.join(BASE_DIR, "data", "disease_to_doctor.csv")
+ALIASES_PATH = os.path.join(BASE_DIR, "data", "disease_aliases.csv")
 
-# Load CSV
-disease_df = pd.read_csv(CSV_PATH)
+# Trailing words that can be left off a disease name ("Dengue Fever" -> "dengue")
+GENERIC_SUFFIXES = ("disease", "disorder", "syndrome", "fever")
 
-def predict_specialist(disease_name):
-    # Normalize input
-    disease_name = disease_name.strip().lower()
+# A fuzzy match is only taken when it reads as a typo of one known name:
+# edit similarity (1 - edits / length) of at least FUZZY_MIN_SCORE, and
+# FUZZY_MARGIN ahead of the next condition. Inputs shorter than
+# FUZZY_MIN_LENGTH are never corrected ("ache" is not "acne"). Anything
+# else ("fever", "cancer", "heart") is only offered as suggestions.
+FUZZY_MIN_SCORE = 0.65
+FUZZY_MARGIN = 0.15
+FUZZY_MIN_LENGTH = 5
+# Candidates taken from the n-gram index before edit similarity decides
+FUZZY_CANDIDATES = 5
+
+# Load CSVs through their compiled snapshots
+disease_df = load_table(CSV_PATH, categorical=("Specialist",))
+alias_df = load_table(ALIASES_PATH)
+
+def _singular(word):
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+def normalize_condition(name):
+    """Lookup key for a condition: lowercase, no possessives or punctuation, singular words
+
+    "Alzheimer's Disease", "alzheimers disease" and "ALZHEIMER DISEASE"
+    all normalize to "alzheimer disease".
+    """
+    name = name.strip().lower().replace("'", "").replace("\u2019", "")
+    words = re.sub(r"[^a-z0-9]+", " ", name).split()
+    return " ".join(_singular(word) for word in words)
+
+def _variants(disease):
+    # The full name, each "/"-separated part ("HIV/AIDS"), and each without a generic suffix
+    for part in [disease] + (disease.split("/") if "/" in disease else []):
+        key = normalize_condition(part)
+        if key:
+            yield key
+        words = key.split()
+        if len(words) > 1 and words[-1] in GENERIC_SUFFIXES:
+            yield " ".join(words[:-1])
+
+def _build_lookup():
+    lookup = {}
+    diseases = disease_df['Disease'].str.strip()
+    specialists = disease_df['Specialist'].str.strip()
+    entries = list(zip(diseases, specialists))
+
+    # Exact names first, so a shortened variant never shadows a real disease
+    for disease, specialist in entries:
+        lookup.setdefault(normalize_condition(disease), (disease, specialist))
+    for disease, specialist in entries:
+        for key in _variants(disease):
+            lookup.setdefault(key, (disease, specialist))
+
+    canonical = {normalize_condition(disease): (disease, specialist) for disease, specialist in entries}
+    for alias, disease in zip(alias_df['Alias'].str.strip(), alias_df['Disease'].str.strip()):
+        target = canonical.get(normalize_condition(disease))
+        if target is not None:
+            lookup.setdefault(normalize_condition(alias), target)
+    return lookup
+
+# Normalized name/alias -> (Disease, Specialist), compiled once at load time
+condition_lookup = _build_lookup()
+
+# (Disease, Specialist) -> every normalized name/alias leading to it
+condition_keys = {}
+for _key, _target in condition_lookup.items():
+    condition_keys.setdefault(_target, []).append(_key)
+
+def resolve_condition(disease_name):
+    """(Disease, Specialist) for a name or alias, or None when unknown"""
+    return condition_lookup.get(normalize_condition(disease_name))
 
-    # Normalize CSV columns
-    disease_df['Disease'] = disease_df['Disease'].str.strip().str.lower()
-    disease_df['Specialist'] = disease_df['Specialist'].str.strip()
+_fuzzy_matcher = None
+_fuzzy_lock = threading.Lock()
 
-    # Match disease
-    match = disease_df[disease_df['Disease'] == disease_name]
+def _get_fuzzy_matcher():
+    # Built on first use; importing scikit-learn is too slow for app startup
+    global _fuzzy_matcher
+    if _fuzzy_matcher is None:
+        with _fuzzy_lock:
+            if _fuzzy_matcher is None:
+                from modules.condition_matcher import FuzzyConditionMatcher
+                keys = list(condition_lookup)
+                _fuzzy_matcher = FuzzyConditionMatcher(keys, [condition_lookup[key] for key in keys])
+    return _fuzzy_matcher
 
-    if not match.empty:
-        return match['Specialist'].values[0]
+def warm_up(background=True):
+    """Build the fuzzy matcher ahead of the first search
+
+    With ``background=True`` it is built on a daemon thread, which is
+    returned; the first lookup waits for it if it is still running.
+    """
+    if not background:
+        _get_fuzzy_matcher()
+        return None
+    thread = threading.Thread(target=_get_fuzzy_matcher, name="matcher-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+def match_conditions(text, k=5, min_score=0.0):
+    """Ranked fuzzy candidates as ((Disease, Specialist), score), best first"""
+    query = normalize_condition(text)
+    if not query:
+        return []
+    return _get_fuzzy_matcher().match(query, k=k, min_score=min_score)
+
+def _edit_similarity(a, b):
+    # 1 - optimal string alignment distance / longer length; a swap of two
+    # neighbouring letters ("athsma") counts as one edit
+    previous, current = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        before, previous, current = previous, current, [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1,
+                             previous[j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], before[j - 2] + 1)
+    return 1 - current[-1] / max(len(a), len(b), 1)
+
+def resolve_condition_fuzzy(disease_name, min_score=FUZZY_MIN_SCORE, margin=FUZZY_MARGIN):
+    """Exact lookup, falling back to a fuzzy match only when it is unambiguous
+
+    The n-gram index proposes candidates, each scored by the edit
+    similarity of the input to its closest name or alias. The best is
+    returned only for inputs of FUZZY_MIN_LENGTH or more characters,
+    when it scores at least ``min_score`` and beats the runner-up by
+    ``margin``. Returns (Disease, Specialist, score), with
+    score 1.0 for exact matches, or None.
+    """
+    match = resolve_condition(disease_name)
+    if match is not None:
+        return match[0], match[1], 1.0
+    query = normalize_condition(disease_name)
+    if len(query) < FUZZY_MIN_LENGTH:
+        return None
+    scored = sorted(((max(_edit_similarity(query, key) for key in condition_keys[target]), target)
+                     for target, _ in match_conditions(disease_name, k=FUZZY_CANDIDATES)),
+                    key=lambda entry: -entry[0])
+    if not scored or scored[0][0] < min_score:
+        return None
+    if len(scored) > 1 and scored[0][0] - scored[1][0] < margin:
+        return None
+    score, (disease, specialist) = scored[0]
+    return disease, specialist, score
+
+def predict_specialist(disease_name):
+    match = resolve_condition(disease_name)
+    if match is not None:
+        return match[1]
     else:
         return None
+
+def predict_specialists(disease_names):
+    """Batch form of predict_specialist: one specialist (or None) per name"""
+    return [predict_specialist(name) for name in disease_names]
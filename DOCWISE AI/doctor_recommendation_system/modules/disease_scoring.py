@@ -0,0 +1,79 @@
+# modules/disease_scoring.py
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Evidence weights: a symptom in an extracted symptom sentence, a symptom
+# anywhere in the text, and the disease named outright. A name alone is no
+# evidence ("cold compress", "ST depression"): the mention weight only
+# counts for a disease some of whose symptoms were found as well.
+EXTRACTED_SYMPTOM_WEIGHT = 2
+TEXT_SYMPTOM_WEIGHT = 1
+MENTION_WEIGHT = 3
+
+class DiseaseScorer:
+    """Sparse disease × symptom weight matrix scoring many documents at once
+
+    Each document becomes a sparse vector of symptom evidence plus a
+    sparse vector of diseases it names; one sparse product with the
+    weight matrix then scores every disease for the whole batch. The
+    cost follows the number of non-zero entries, not diseases × symptoms.
+    Disease and symptom names are lowercase; ties rank in file order.
+    """
+
+    def __init__(self, table):
+        diseases = table["Disease"].str.strip().str.lower()
+        symptoms = table["Symptom"].str.strip().str.lower()
+        weights = pd.to_numeric(table["Weight"], errors="coerce").fillna(1.0).to_numpy(dtype=float)
+
+        self.diseases = list(dict.fromkeys(diseases))
+        self.symptoms = list(dict.fromkeys(symptoms))
+        self._disease_ids = {disease: i for i, disease in enumerate(self.diseases)}
+        self._symptom_ids = {symptom: i for i, symptom in enumerate(self.symptoms)}
+        rows = [self._disease_ids[disease] for disease in diseases]
+        cols = [self._symptom_ids[symptom] for symptom in symptoms]
+        # Symptoms × diseases, so document vectors multiply on the left
+        self.weights = sparse.csr_matrix((weights, (cols, rows)),
+                                         shape=(len(self.symptoms), len(self.diseases)))
+
+    @classmethod
+    def from_csv(cls, path):
+        return cls(pd.read_csv(path))
+
+    def symptoms_of(self, disease):
+        column = self.weights[:, self._disease_ids[disease]]
+        return [self.symptoms[i] for i in column.nonzero()[0]]
+
+    def _matrix(self, rows, ids, width):
+        # rows: one {term: amount} per document -> CSR of shape (len(rows), width)
+        indptr, indices, data = [0], [], []
+        for row in rows:
+            for term, amount in row.items():
+                term_id = ids.get(term)
+                if term_id is not None:
+                    indices.append(term_id)
+                    data.append(amount)
+            indptr.append(len(indices))
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(rows), width))
+
+    def score_batch(self, evidence):
+        """Disease scores, shape (documents, diseases), for [(symptom_counts, mentioned), ...]
+
+        ``symptom_counts`` maps symptom -> evidence weight for a document;
+        ``mentioned`` holds the diseases it names, which add MENTION_WEIGHT
+        only where the disease also has symptom evidence. Unknown terms are
+        ignored.
+        """
+        if not evidence:
+            return np.zeros((0, len(self.diseases)))
+        symptom_vectors = self._matrix([counts for counts, _ in evidence], self._symptom_ids, len(self.symptoms))
+        mention_vectors = self._matrix([dict.fromkeys(mentioned, MENTION_WEIGHT) for _, mentioned in evidence],
+                                       self._disease_ids, len(self.diseases))
+        symptom_scores = (symptom_vectors @ self.weights).toarray()
+        return symptom_scores + mention_vectors.toarray() * (symptom_scores > 0)
+
+    def top(self, scores, k=3):
+        """The k best (disease, score) of one score row, skipping zero scores"""
+        order = np.lexsort((np.arange(len(scores)), -scores))[:k]
+        return [(self.diseases[i], float(scores[i])) for i in order if scores[i] > 0]
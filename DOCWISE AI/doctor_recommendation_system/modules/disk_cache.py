@@ -0,0 +1,217 @@
+# modules/disk_cache.py
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+_MISS = object()
+
+logger = logging.getLogger(__name__)
+
+class DiskCache:
+    """Size-bounded LRU cache of JSON values, one file per key
+
+    Writes go to a temp file that is renamed into place, so readers in any
+    process see either the old value or the new one. A hit touches the
+    file's mtime, which is what eviction orders by. get_or_compute()
+    coalesces concurrent misses on the same key: within a process through
+    an in-flight event, across processes through a ``<key>.lock`` file.
+    A directory that cannot be written (read-only install) only disables
+    caching: values are still computed and returned, just not stored.
+    """
+
+    LOCK_STALE_SECONDS = 600
+    LOCK_POLL_SECONDS = 0.2
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._flights = {}
+        self._warned = False
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    def get(self, key, default=None):
+        value = self._read(key)
+        self._count(value is not _MISS)
+        return default if value is _MISS else value
+
+    def _read(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            return _MISS
+        try:
+            os.utime(path)
+        except OSError:
+            pass  # evicted meanwhile; the value we read is still good
+        return value
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def set(self, key, value):
+        self.set_many([(key, value)])
+
+    def set_many(self, items):
+        """Store several (key, value) pairs, evicting once after all of them"""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            for key, value in items:
+                self._write(key, value)
+        except OSError as e:
+            self._unavailable(e)
+            return
+        self.evict()
+
+    def _write(self, key, value):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(value, f)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def get_or_compute(self, key, compute, cacheable=None):
+        """Return the cached value for key, computing it at most once at a time
+
+        A computed value is only stored when ``cacheable(value)`` is true
+        (always, without a predicate).
+        """
+        while True:
+            value = self._read(key)
+            if value is not _MISS:
+                self._count(True)
+                return value
+
+            with self._lock:
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[key] = threading.Event()
+            if not leader:
+                # Another thread is computing it; re-check once it finishes
+                flight.wait()
+                continue
+
+            try:
+                try:
+                    acquired = self._acquire_file_lock(key)
+                except OSError as e:
+                    self._unavailable(e)
+                    self._count(False)
+                    return compute()
+                if not acquired:
+                    self._wait_for_file_lock(key)
+                    continue
+                try:
+                    value = self._read(key)
+                    if value is not _MISS:
+                        self._count(True)
+                        return value
+                    self._count(False)
+                    value = compute()
+                    if cacheable is None or cacheable(value):
+                        self.set(key, value)
+                    return value
+                finally:
+                    self._release_file_lock(key)
+            finally:
+                with self._lock:
+                    del self._flights[key]
+                flight.set()
+
+    def _unavailable(self, error):
+        # Warn once per cache; every later failure is the same condition
+        log = logger.debug if self._warned else logger.warning
+        self._warned = True
+        log("Cache %s unavailable, running without it: %s", self.directory, error)
+
+    def stats(self):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {"hits": hits, "misses": misses, "hit_rate": hits / total if total else 0.0}
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits max_bytes"""
+        entries = []
+        total = 0
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if not entry.name.endswith(".json"):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        except OSError:
+            return
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def _lock_path(self, key):
+        return os.path.join(self.directory, key + ".lock")
+
+    def _acquire_file_lock(self, key):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._lock_path(key)
+        while True:
+            try:
+                os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return True
+            except FileExistsError:
+                if not self._lock_is_stale(path):
+                    return False
+                # The process holding it died mid-compute
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def _release_file_lock(self, key):
+        try:
+            os.remove(self._lock_path(key))
+        except OSError:
+            pass
+
+    def _lock_is_stale(self, path):
+        try:
+            return time.time() - os.path.getmtime(path) > self.LOCK_STALE_SECONDS
+        except FileNotFoundError:
+            return False
+
+    def _wait_for_file_lock(self, key):
+        path = self._lock_path(key)
+        while os.path.exists(path) and not self._lock_is_stale(path):
+            time.sleep(self.LOCK_POLL_SECONDS)
@@ -1,29 +1,289 @@
+import glob
+import logging
+import os
+import re
+import sqlite3
+import threading
+import weakref
+
+import numpy as np
 import pandas as pd
 
-# Load doctor profiles
-doctor_df = pd.read_csv("doctor_recommendation_system/data/doctor_profiles.csv")
+from modules.doctor_store import DoctorStore, store_path
+from modules.snapshot import csv_signature, load_table, snapshot_path
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH = os.path.join(BASE_DIR, "data", "doctor_profiles.csv")
+
+# "sqlite" queries the indexed database page by page; "memory" loads the
+# whole CSV and answers from a prebuilt DoctorIndex
+DOCTOR_BACKEND = "sqlite"
+DOCTOR_BACKENDS = ("sqlite", "memory")
+
+# Seconds between checks of doctor_profiles.csv for changes
+RELOAD_INTERVAL = 5.0
+
+logger = logging.getLogger(__name__)
+
+class _DoctorGroup:
+    """Row positions of one (specialist, location) pair, presorted for queries
+
+    ``by_experience`` is ordered by Experience (desc) for queries without a
+    rating filter. ``rating_buckets`` holds one Experience-sorted array per
+    distinct Rating, highest rating first. Thresholds become prefix lengths
+    found with np.searchsorted on the negated, ascending sort keys.
+    """
+
+    def __init__(self, positions, experience, rating):
+        keep = positions[~np.isnan(experience[positions])]
+        order = np.argsort(-experience[keep], kind="stable")
+        self.by_experience = keep[order]
+        self.neg_experience = -experience[self.by_experience]
+
+        self.bucket_ratings = np.empty(0)
+        self.rating_buckets = []
+        if rating is not None:
+            rated = keep[~np.isnan(rating[keep])]
+            # lexsort: last key is primary -> Rating desc, then Experience desc
+            rated = rated[np.lexsort((-experience[rated], -rating[rated]))]
+            ratings = rating[rated]
+            starts = np.flatnonzero(np.r_[True, ratings[1:] != ratings[:-1]])
+            ends = np.r_[starts[1:], len(rated)]
+            self.bucket_ratings = -ratings[starts]
+            self.rating_buckets = [(rated[s:e], -experience[rated[s:e]]) for s, e in zip(starts, ends)]
+
+    def select(self, min_experience, min_rating):
+        if min_rating is None:
+            count = np.searchsorted(self.neg_experience, -min_experience, side="right")
+            return self.by_experience[:count]
+        n_buckets = np.searchsorted(self.bucket_ratings, -min_rating, side="right")
+        parts = []
+        for positions, neg_experience in self.rating_buckets[:n_buckets]:
+            count = np.searchsorted(neg_experience, -min_experience, side="right")
+            parts.append(positions[:count])
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.intp)
+
+
+class DoctorIndex:
+    """Normalized specialist -> location -> presorted rows, built once per dataset
+
+    Location ``None`` is indexed too, so queries with and without a
+    location cost the same: a dict lookup, a few binary searches and the
+    final row gather.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        specialists = df["Specialist"].astype(str).str.strip().str.lower()
+        locations = df["Location"].astype(str).str.strip().str.lower()
+        experience = pd.to_numeric(df["Experience"], errors="coerce").to_numpy(dtype=float)
+        rating = None
+        if "Rating" in df.columns:
+            rating = pd.to_numeric(df["Rating"], errors="coerce").to_numpy(dtype=float)
+        self.has_rating = rating is not None
+        self.experience = experience
+        self.rating = rating if rating is not None else np.full(len(df), np.nan)
+        self.location_keys = locations.to_numpy(dtype=object)
+
+        self._groups = {}
+        for specialist, positions in specialists.groupby(specialists).indices.items():
+            self._groups[(specialist, None)] = _DoctorGroup(positions, experience, rating)
+        for (specialist, location), positions in df.groupby([specialists, locations]).indices.items():
+            self._groups[(specialist, location)] = _DoctorGroup(positions, experience, rating)
+
+    def positions(self, specialist, location=None, min_experience=0, min_rating=None):
+        key = (specialist.strip().lower(), location.strip().lower() if location else None)
+        group = self._groups.get(key)
+        if group is None:
+            return np.empty(0, dtype=np.intp)
+        return group.select(min_experience, min_rating if self.has_rating else None)
+
+    def query(self, specialist, location=None, min_experience=0, min_rating=None, limit=None, offset=0):
+        positions = self.positions(specialist, location, min_experience, min_rating)
+        stop = None if limit is None else offset + limit
+        return self.df.iloc[positions[offset:stop]]
+
+    def candidates(self, specialist, location=None, min_experience=0, min_rating=None):
+        positions = self.positions(specialist, location, min_experience, min_rating)
+        return {
+            "id": positions,
+            "experience": self.experience[positions],
+            "rating": self.rating[positions],
+            "location": self.location_keys[positions],
+        }
+
+
+class DoctorDataset:
+    """One immutable version of doctor_profiles.csv, ready to query
+
+    Nothing in a dataset changes after it is built; a changed CSV yields
+    a new dataset with the next version number. A caller that grabs one
+    dataset and runs several queries on it (candidates, then rows) sees
+    a single consistent version even if a reload lands in between.
+    Each CSV version is read from its own database or snapshot file, so
+    building a new version never touches a file an older one has open;
+    the file is deleted once no dataset uses it.
+    """
+
+    def __init__(self, version, backend):
+        self.version = version
+        # The backend asked for; ``backend`` is the one actually serving
+        self.requested_backend = backend
+        self.backend = backend
+        # Taken before loading, so a CSV edited mid-load is picked up again
+        self.signature = csv_signature(DATA_PATH)
+        if backend == "sqlite":
+            self.path = store_path(DATA_PATH, self.signature)
+            self.store = DoctorStore(self.path, DATA_PATH)
+            try:
+                self.store.ensure_current()
+            except (OSError, sqlite3.Error) as e:
+                # e.g. a read-only install: serve this version from memory instead
+                logger.warning("Doctor database unavailable (%s); using the memory backend", e)
+                self.backend = "memory"
+        if self.backend == "memory":
+            self.path = snapshot_path(DATA_PATH, self.signature)
+            table = load_table(DATA_PATH, categorical=("Specialist", "Location"), path=self.path)
+            self.index = DoctorIndex(table)
+        _live_files[self.path] = self
+        _own_files.add(self.path)
+        weakref.finalize(self, _remove_if_released, self.path)
+
+    def query(self, specialist, location=None, min_experience=0, min_rating=None, limit=None, offset=0):
+        if self.backend == "sqlite":
+            return self.store.query(specialist, location, min_experience, min_rating, limit, offset)
+        return self.index.query(specialist, location, min_experience, min_rating, limit, offset)
+
+    def candidates(self, specialist, location=None, min_experience=0, min_rating=None):
+        if self.backend == "sqlite":
+            return self.store.candidates(specialist, location, min_experience, min_rating)
+        return self.index.candidates(specialist, location, min_experience, min_rating)
+
+    def rows(self, ids):
+        if self.backend == "sqlite":
+            return self.store.rows(ids)
+        return self.index.df.iloc[np.asarray(ids, dtype=np.intp)]
+
+    def all_doctors(self, limit=None, offset=0):
+        if self.backend == "sqlite":
+            return self.store.all_doctors(limit, offset)
+        stop = None if limit is None else offset + limit
+        return self.index.df.iloc[offset:stop]
+
+    def value_counts(self, column):
+        if self.backend == "sqlite":
+            return self.store.value_counts(column)
+        return self.index.df[column].astype(str).str.strip().value_counts()
+
+
+# Per-version data file -> the dataset reading it
+_live_files = weakref.WeakValueDictionary()
+# Every per-version data file this process has built or opened
+_own_files = set()
+
+# The CSV modification time in a per-version file name (signature "<mtime>:<size>")
+_NAME_MTIME = re.compile(r"\.(\d+)-\d+\.(?:sqlite3|snap)$")
+
+def _remove_if_released(path):
+    if _live_files.get(path) is None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass  # already gone, or still open (Windows); swept after the next load
+
+def _is_superseded(path, signature):
+    # Named after a CSV version written before the current one; another
+    # instance can only still be on it until its next poll
+    match = _NAME_MTIME.search(path)
+    return match is not None and int(match.group(1)) < int(signature.split(":")[0])
+
+def _remove_released_files(signature):
+    # Unreferenced files of this process's dataset versions, by either
+    # backend, plus superseded ones left behind by earlier runs. The
+    # current version's file may belong to another running instance
+    for path in glob.glob(store_path(DATA_PATH, "*")) + glob.glob(snapshot_path(DATA_PATH, "*")):
+        if path in _own_files or _is_superseded(path, signature):
+            _remove_if_released(path)
+
+_dataset = None
+_reload_lock = threading.Lock()
+
+def _load_next_version():
+    # Caller holds _reload_lock
+    global _dataset
+    version = _dataset.version + 1 if _dataset is not None else 1
+    dataset = DoctorDataset(version, DOCTOR_BACKEND)
+    # A single reference assignment: readers see the old or the new version, never a mix
+    _dataset = dataset
+    logger.info("Loaded doctor data version %d (%s backend)", dataset.version, dataset.backend)
+    _remove_released_files(dataset.signature)
+    return dataset
+
+def reload_dataset():
+    """Build the next dataset version from the CSV and swap it in"""
+    with _reload_lock:
+        return _load_next_version()
+
+def current_dataset():
+    """The live dataset; lock-free unless it has never been built or the backend changed"""
+    dataset = _dataset
+    if dataset is None or dataset.requested_backend != DOCTOR_BACKEND:
+        with _reload_lock:
+            dataset = _dataset
+            if dataset is None or dataset.requested_backend != DOCTOR_BACKEND:
+                dataset = _load_next_version()
+    return dataset
+
+def data_version():
+    return current_dataset().version
+
+_watcher = None
+_watcher_lock = threading.Lock()
+
+def _watch(stop):
+    # The first version is built here straight away, off the caller's (UI)
+    # thread; an early search just waits for it rather than building twice
+    try:
+        current_dataset()
+    except Exception:
+        logger.exception("Loading doctor data failed")
+    while not stop.wait(RELOAD_INTERVAL):
+        try:
+            if csv_signature(DATA_PATH) != current_dataset().signature:
+                reload_dataset()
+        except Exception:
+            # A half-written or malformed CSV keeps the current version; retried next poll
+            logger.exception("Reloading doctor data failed")
+
+def start_watcher():
+    """Load the doctor data, then poll the CSV and reload it on change, in a daemon thread
 
-def get_doctors_by_specialist(specialist, location=None, min_experience=0, min_rating=None):
-    # Ensure consistent formatting
-    doctor_df['Specialist'] = doctor_df['Specialist'].str.strip().str.lower()
-    specialist = specialist.strip().lower()
+    Returns the thread's stop event.
+    """
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None:
+            stop = threading.Event()
+            threading.Thread(target=_watch, args=(stop,), name="doctor-data-watcher", daemon=True).start()
+            _watcher = stop
+    return _watcher
 
-    filtered = doctor_df[doctor_df['Specialist'] == specialist]
+def get_doctors_by_specialist(specialist, location=None, min_experience=0, min_rating=None, limit=None, offset=0):
+    # Sorted by rating first, then experience; by experience only without a rating filter
+    return current_dataset().query(specialist, location, min_experience, min_rating, limit, offset)
 
-    # Filter by location (optional)
-    if location:
-        filtered = filtered[filtered['Location'].str.strip().str.lower() == location.strip().lower()]
+def get_candidates(specialist, location=None, min_experience=0, min_rating=None):
+    """Ranking inputs for every match as arrays: id, experience, rating, location (normalized)"""
+    return current_dataset().candidates(specialist, location, min_experience, min_rating)
 
-    # Filter by experience
-    filtered = filtered[filtered['Experience'] >= min_experience]
+def get_doctors_by_ids(ids):
+    """Full doctor rows for ids from get_candidates, in the given order"""
+    return current_dataset().rows(ids)
 
-    # Filter by rating if column exists
-    if min_rating is not None and "Rating" in filtered.columns:
-        filtered = filtered[filtered['Rating'] >= min_rating]
-        # Sort by rating first, then experience
-        filtered = filtered.sort_values(by=["Rating", "Experience"], ascending=[False, False])
-    else:
-        # Only sort by experience if rating is missing
-        filtered = filtered.sort_values(by="Experience", ascending=False)
+def get_all_doctors(limit=None, offset=0):
+    """All doctors in CSV order, one page at a time"""
+    return current_dataset().all_doctors(limit, offset)
 
-    return filtered
\ No newline at end of file
+def count_doctors_by(column):
+    """Doctors per stripped value of "Specialist" or "Location", most common first"""
+    return current_dataset().value_counts(column)
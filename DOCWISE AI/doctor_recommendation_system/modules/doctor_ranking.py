@@ -0,0 +1,208 @@
+# modules/doctor_ranking.py
+
+import numpy as np
+
+from modules.disease_mapper import normalize_condition, resolve_condition, resolve_condition_fuzzy
+from modules.doctor_filtering import current_dataset
+from modules.geo import nearby_cities, proximity
+from modules.memory_cache import LRUCache
+
+# Share of the score from each signal; every signal is scaled to [0, 1]
+RANKING_WEIGHTS = {"rating": 0.5, "experience": 0.3, "location": 0.2}
+MAX_RATING = 5.0
+# Experience beyond this many years no longer raises the score
+EXPERIENCE_CAP = 30.0
+
+PAGE_SIZE = 20
+
+# Repeated patient searches are answered from memory for this long
+SEARCH_CACHE_ENTRIES = 256
+SEARCH_CACHE_TTL = 300.0
+# Scored matches per query, so later cursor pages skip fetching and scoring
+SCORED_CACHE_ENTRIES = 64
+
+class WeightedScorer:
+    """Weighted sum of rating, experience and proximity to the searched location
+
+    Any callable taking (candidates, location) and returning one score
+    per candidate can be passed to ranked_search instead; candidates is
+    the dict of arrays from DoctorDataset.candidates.
+    """
+
+    def __init__(self, weights=None):
+        self.weights = dict(RANKING_WEIGHTS, **(weights or {}))
+
+    def __call__(self, candidates, location):
+        rating = np.nan_to_num(candidates["rating"]) / MAX_RATING
+        experience = np.clip(np.nan_to_num(candidates["experience"]), 0, EXPERIENCE_CAP) / EXPERIENCE_CAP
+        if location:
+            # Same city scores 1, nearby cities less, per geo.proximity
+            nearby = proximity(candidates["location"], location)
+        else:
+            nearby = np.zeros(len(rating))
+        return (self.weights["rating"] * rating
+                + self.weights["experience"] * experience
+                + self.weights["location"] * nearby)
+
+
+class RankedPage:
+    """One page of ranked doctors
+
+    ``next_cursor`` is passed back to ranked_search for the following
+    page and is None on the last one; ``total`` counts all matches.
+    """
+
+    def __init__(self, doctors, scores, next_cursor, total):
+        self.doctors = doctors
+        self.scores = scores
+        self.next_cursor = next_cursor
+        self.total = total
+
+
+def _encode_cursor(score, doctor_id):
+    # float.hex round-trips exactly, so no candidate is skipped or repeated
+    return f"{float(score).hex()}:{int(doctor_id)}"
+
+def _decode_cursor(cursor):
+    score, doctor_id = cursor.split(":")
+    return float.fromhex(score), int(doctor_id)
+
+def top_k(scores, ids, k):
+    """Positions of the k best (score desc, id asc) entries, best first
+
+    np.argpartition selects the k best in linear time; only those k are
+    then sorted, so the cost stays O(n + k log k) for any n.
+    """
+    if len(scores) > k:
+        # Every entry tied with the k-th score stays in, so ties break by id below
+        kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+        keep = np.flatnonzero(scores >= kth)
+    else:
+        keep = np.arange(len(scores))
+    order = np.lexsort((ids[keep], -scores[keep]))
+    return keep[order][:k]
+
+scored_cache = LRUCache(SCORED_CACHE_ENTRIES, SEARCH_CACHE_TTL)
+
+def ranked_search(specialist, location=None, min_experience=0, min_rating=None,
+                  page_size=PAGE_SIZE, cursor=None, scorer=None, nearby_only=False, dataset=None):
+    """Best-scoring doctors for specialist, one page per call
+
+    Doctors elsewhere still match but rank below local ones of similar
+    standing; ``nearby_only`` restricts matches to the cities within
+    geo.PROXIMITY_RADIUS_KM of ``location``. The scored matches are
+    cached per query and data version, so a cursor page only selects.
+    """
+    # Candidates and rows come from the same data version, even across a reload
+    dataset = dataset or current_dataset()
+    key = ("ranked", specialist.strip().lower(), location.strip().lower() if location else None,
+           min_experience, min_rating, scorer, nearby_only)
+
+    def score():
+        if nearby_only and location:
+            candidates = _concat([dataset.candidates(specialist, city, min_experience, min_rating)
+                                  for city in nearby_cities(location, dataset=dataset)])
+        else:
+            candidates = dataset.candidates(specialist, None, min_experience, min_rating)
+        return (scorer or WeightedScorer())(candidates, location), candidates["id"]
+
+    scores, ids = scored_cache.get_or_compute(key, dataset.version, score)
+    return _page(dataset, scores, ids, page_size, cursor)
+
+def _concat(parts):
+    return {field: np.concatenate([part[field] for part in parts]) for field in parts[0]}
+
+def _page(dataset, scores, ids, page_size, cursor):
+    total = len(ids)
+    if cursor:
+        # Everything ranked after the last doctor of the previous page
+        last_score, last_id = _decode_cursor(cursor)
+        after = (scores < last_score) | ((scores == last_score) & (ids > last_id))
+        scores, ids = scores[after], ids[after]
+
+    best = top_k(scores, ids, page_size + 1)
+    page = best[:page_size]
+    next_cursor = None
+    if len(best) > page_size:
+        next_cursor = _encode_cursor(scores[page[-1]], ids[page[-1]])
+    return RankedPage(dataset.rows(ids[page]), scores[page], next_cursor, total)
+
+def multi_specialist_search(weighted_specialists, location=None, min_experience=0, min_rating=None,
+                            page_size=PAGE_SIZE, cursor=None, scorer=None, dataset=None):
+    """One ranked shortlist across several (specialist, weight) pairs
+
+    Weights of a repeated specialist add up (two diseases pointing at a
+    Cardiologist count for both) and are scaled so the heaviest is 1.
+    Each specialist's candidates come from its own index lookup; they
+    are then scored, weighted and paged together in a single pass, and a
+    doctor appears at most once.
+    """
+    weights = {}
+    for specialist, weight in weighted_specialists:
+        key = specialist.strip().lower()
+        weights[key] = weights.get(key, 0.0) + weight
+    top_weight = max(weights.values(), default=0.0)
+    dataset = dataset or current_dataset()
+    key = ("multi", tuple(sorted(weights.items())), location.strip().lower() if location else None,
+           min_experience, min_rating, scorer)
+
+    def score():
+        parts, part_weights = [], []
+        for specialist, weight in weights.items():
+            if weight <= 0:
+                continue
+            candidates = dataset.candidates(specialist, None, min_experience, min_rating)
+            parts.append(candidates)
+            part_weights.append(np.full(len(candidates["id"]), weight / top_weight))
+        if not parts:
+            return np.empty(0), np.empty(0, dtype=np.int64)
+
+        candidates = _concat(parts)
+        scores = (scorer or WeightedScorer())(candidates, location) * np.concatenate(part_weights)
+        ids = candidates["id"]
+        # Every doctor row has one specialist, but keep the best entry should ids repeat
+        order = np.lexsort((-scores, ids))
+        first = np.r_[True, ids[order][1:] != ids[order][:-1]]
+        keep = order[first]
+        return scores[keep], ids[keep]
+
+    scores, ids = scored_cache.get_or_compute(key, dataset.version, score)
+    return _page(dataset, scores, ids, page_size, cursor)
+
+def search_for_diseases(diseases, location=None, min_experience=0, min_rating=None, page_size=PAGE_SIZE):
+    """Shortlist for predict_disease output: [(disease, score), ...] weighted by score
+
+    Diseases without a known specialist are skipped.
+    """
+    weighted = []
+    for disease, score in diseases:
+        match = resolve_condition(disease)
+        if match is not None:
+            weighted.append((match[1], score))
+    return multi_specialist_search(weighted, location, min_experience, min_rating, page_size=page_size)
+
+search_cache = LRUCache(SEARCH_CACHE_ENTRIES, SEARCH_CACHE_TTL)
+
+def search_doctors(condition, location=None, min_experience=0, min_rating=None, page_size=PAGE_SIZE,
+                   nearby_only=False):
+    """Resolve a condition and rank its doctors, cached per distinct search
+
+    Returns (match, page): match is resolve_condition_fuzzy's
+    (disease, specialist, score) or None, page the first RankedPage or
+    None. ``nearby_only`` is passed on to ranked_search. Cached results
+    are tied to the doctor data version, so a reloaded CSV is never
+    answered from an older result. Treat the returned page as read-only;
+    it is shared with later hits.
+    """
+    key = (normalize_condition(condition), location.strip().lower() if location else None,
+           min_experience, min_rating, page_size, nearby_only)
+    dataset = current_dataset()
+
+    def search():
+        match = resolve_condition_fuzzy(condition)
+        if match is None:
+            return None, None
+        return match, ranked_search(match[1], location, min_experience, min_rating,
+                                    page_size=page_size, nearby_only=nearby_only, dataset=dataset)
+
+    return search_cache.get_or_compute(key, dataset.version, search)
@@ -0,0 +1,216 @@
+# modules/doctor_store.py
+#
+# SQLite storage for doctor profiles. The database is built from
+# data/doctor_profiles.csv by a one-shot import; each version of the CSV
+# gets its own database file, named after its signature. Build the one
+# for the current CSV by hand with
+#     python -m modules.doctor_store
+
+import os
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+from modules.snapshot import csv_signature
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CSV_PATH = os.path.join(BASE_DIR, "data", "doctor_profiles.csv")
+STORE_DIR = os.path.join(BASE_DIR, "cache")
+
+# Rows read from the CSV per insert batch; bounds importer memory
+IMPORT_CHUNK_ROWS = 50000
+
+# Result columns, named as in the CSV
+COLUMNS = ("Name", "Specialist", "Location", "Experience", "Contact", "Rating")
+
+SCHEMA = """
+CREATE TABLE doctors (
+    id INTEGER PRIMARY KEY,
+    name TEXT,
+    specialist TEXT,
+    location TEXT,
+    experience NUMERIC,
+    contact TEXT,
+    rating REAL,
+    specialist_key TEXT NOT NULL,
+    location_key TEXT NOT NULL
+);
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+# One index per query shape, each already in result order, so a page is
+# read straight off the index without sorting the matches first
+INDEXES = """
+CREATE INDEX doctors_location_rating ON doctors (specialist_key, location_key, rating DESC, experience DESC);
+CREATE INDEX doctors_location_experience ON doctors (specialist_key, location_key, experience DESC);
+CREATE INDEX doctors_rating ON doctors (specialist_key, rating DESC, experience DESC);
+CREATE INDEX doctors_experience ON doctors (specialist_key, experience DESC);
+"""
+
+SELECT_COLUMNS = ("id, name AS Name, specialist AS Specialist, location AS Location, "
+                  "experience AS Experience, contact AS Contact, rating AS Rating")
+
+def store_path(csv_path=CSV_PATH, signature=None):
+    """Database file for one version of the CSV (default: its current signature)"""
+    signature = signature or csv_signature(csv_path)
+    return os.path.join(STORE_DIR, f"doctors.{signature.replace(':', '-')}.sqlite3")
+
+def _null(value):
+    return None if pd.isna(value) else value
+
+def import_csv(csv_path=CSV_PATH, db_path=None):
+    """Build the database from the CSV; returns the number of rows imported
+
+    Rows are streamed in chunks into a temporary file that is renamed to
+    ``db_path`` (default: store_path(csv_path)) only once complete, so
+    readers never see a partial import. Row ids are the CSV row positions.
+    """
+    db_path = db_path or store_path(csv_path)
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    tmp_path = f"{db_path}.{os.getpid()}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    signature = csv_signature(csv_path)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(SCHEMA)
+        count = 0
+        for chunk in pd.read_csv(csv_path, chunksize=IMPORT_CHUNK_ROWS, dtype={"Contact": str}):
+            if "Rating" not in chunk.columns:
+                chunk["Rating"] = None
+            specialists = chunk["Specialist"].astype(str).str.strip().str.lower()
+            locations = chunk["Location"].astype(str).str.strip().str.lower()
+            rows = zip(range(count, count + len(chunk)), *(chunk[column] for column in COLUMNS),
+                       specialists, locations)
+            conn.executemany(
+                "INSERT INTO doctors VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                ([row[0]] + [_null(value) for value in row[1:]] for row in rows)
+            )
+            count += len(chunk)
+        # Indexes are cheaper to build once over the full table than row by row
+        conn.executescript(INDEXES)
+        conn.execute("INSERT INTO meta VALUES ('csv_signature', ?)", (signature,))
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, db_path)
+    return count
+
+
+class DoctorStore:
+    """Indexed, paginated doctor queries over the SQLite database
+
+    Nothing is read into memory up front: each query fetches only the
+    requested page. Connections are per thread, since sqlite3 connections
+    cannot be shared between threads.
+    """
+
+    def __init__(self, db_path=None, csv_path=CSV_PATH):
+        self.db_path = db_path or store_path(csv_path)
+        self.csv_path = csv_path
+        self._local = threading.local()
+        self._checked = False
+        self._lock = threading.Lock()
+
+    def _is_current(self):
+        if not os.path.exists(self.db_path):
+            return False
+        if not os.path.exists(self.csv_path):
+            return True
+        try:
+            with sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True) as conn:
+                row = conn.execute("SELECT value FROM meta WHERE key = 'csv_signature'").fetchone()
+        except sqlite3.Error:
+            return False
+        return row is not None and row[0] == csv_signature(self.csv_path)
+
+    def ensure_current(self):
+        """Import the CSV if the database is missing or older than it"""
+        if not self._checked:
+            with self._lock:
+                if not self._checked:
+                    if not self._is_current():
+                        import_csv(self.csv_path, self.db_path)
+                    self._checked = True
+
+    def _connection(self):
+        self.ensure_current()
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+            self._local.conn = conn
+        return conn
+
+    def _frame(self, sql, params):
+        df = pd.read_sql_query(sql, self._connection(), params=params, index_col="id")
+        df.index.name = None
+        return df
+
+    def _where(self, specialist, location, min_experience, min_rating):
+        where = ["specialist_key = ?", "experience >= ?"]
+        params = [specialist.strip().lower(), min_experience]
+        if location:
+            where.append("location_key = ?")
+            params.append(location.strip().lower())
+        if min_rating is not None:
+            where.append("rating >= ?")
+            params.append(min_rating)
+        return " AND ".join(where), params
+
+    def query(self, specialist, location=None, min_experience=0, min_rating=None, limit=None, offset=0):
+        """Matching doctors as a DataFrame, ordered like DoctorIndex.query"""
+        where, params = self._where(specialist, location, min_experience, min_rating)
+        order = "rating DESC, experience DESC, id" if min_rating is not None else "experience DESC, id"
+        params += [-1 if limit is None else limit, offset]
+        return self._frame(
+            f"SELECT {SELECT_COLUMNS} FROM doctors WHERE {where} "
+            f"ORDER BY {order} LIMIT ? OFFSET ?",
+            params
+        )
+
+    def candidates(self, specialist, location=None, min_experience=0, min_rating=None):
+        """Ranking inputs of every match, unordered: id, experience, rating and location arrays"""
+        where, params = self._where(specialist, location, min_experience, min_rating)
+        rows = self._connection().execute(
+            f"SELECT id, experience, rating, location_key FROM doctors WHERE {where}", params
+        ).fetchall()
+        ids, experience, rating, locations = zip(*rows) if rows else ((), (), (), ())
+        return {
+            "id": np.array(ids, dtype=np.int64),
+            "experience": np.array(experience, dtype=float),
+            "rating": np.array([np.nan if value is None else value for value in rating], dtype=float),
+            "location": np.array(locations, dtype=object),
+        }
+
+    def rows(self, ids):
+        """Doctors with the given ids, in that order"""
+        ids = [int(i) for i in ids]
+        df = self._frame(
+            f"SELECT {SELECT_COLUMNS} FROM doctors WHERE id IN ({', '.join('?' * len(ids))})", ids
+        )
+        return df.loc[ids]
+
+    def all_doctors(self, limit=None, offset=0):
+        """Doctors in CSV order as a DataFrame"""
+        return self._frame(
+            f"SELECT {SELECT_COLUMNS} FROM doctors ORDER BY id LIMIT ? OFFSET ?",
+            [-1 if limit is None else limit, offset]
+        )
+
+    def value_counts(self, column):
+        """Doctors per stripped value of a CSV column, most common first"""
+        name = {"Specialist": "specialist", "Location": "location"}[column]
+        rows = self._connection().execute(
+            f"SELECT TRIM({name}) AS value, COUNT(*) AS n FROM doctors "
+            f"GROUP BY value ORDER BY n DESC, value"
+        ).fetchall()
+        return pd.Series(dict(rows), dtype="int64")
+
+
+if __name__ == "__main__":
+    path = store_path()
+    imported = import_csv(CSV_PATH, path)
+    print(f"Imported {imported} doctor(s) into {path}")
@@ -0,0 +1,164 @@
+# modules/geo.py
+
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from modules.doctor_filtering import current_dataset
+from modules.snapshot import load_table
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CITIES_PATH = os.path.join(BASE_DIR, "data", "city_coordinates.csv")
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Proximity scoring falls from 1 in the same city to 0 at this distance
+PROXIMITY_RADIUS_KM = 100.0
+
+city_df = load_table(CITIES_PATH)
+
+# Normalized city name -> (latitude, longitude) in radians
+city_coordinates = {
+    name.strip().lower(): (np.radians(lat), np.radians(lon))
+    for name, lat, lon in zip(city_df["City"], city_df["Latitude"], city_df["Longitude"])
+}
+
+def locate(place):
+    """(latitude, longitude) in radians for a city name or a (lat, lon) pair in degrees, or None"""
+    if isinstance(place, str):
+        return city_coordinates.get(place.strip().lower())
+    lat, lon = place
+    return np.radians(lat), np.radians(lon)
+
+def distance_km(origin, cities):
+    """Great-circle distance from origin to each named city; NaN where a city is unknown"""
+    lat, lon = origin
+    points = np.array([city_coordinates.get(city.strip().lower(), (np.nan, np.nan)) for city in cities])
+    if not len(points):
+        return np.empty(0)
+    dlat = points[:, 0] - lat
+    dlon = points[:, 1] - lon
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat) * np.cos(points[:, 0]) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+def proximity(locations, place, radius_km=PROXIMITY_RADIUS_KM):
+    """Score in [0, 1] per location: 1 in place itself, falling linearly to 0 at radius_km
+
+    Locations without coordinates, or an unknown place, fall back to an
+    exact name match. Distances are computed once per distinct location.
+    """
+    key = place.strip().lower()
+    cities, inverse = np.unique(np.asarray(locations, dtype=str), return_inverse=True)
+    exact = (cities == key).astype(float)
+    origin = locate(place)
+    if origin is None:
+        return exact[inverse]
+    scores = np.clip(1 - distance_km(origin, cities) / radius_km, 0, 1)
+    return np.where(np.isnan(scores), exact, scores)[inverse]
+
+
+class CityIndex:
+    """Ball tree over the cities doctors practise in, on haversine distance
+
+    Radius and nearest-city lookups take logarithmic time in the number
+    of cities; doctors are then fetched per city through the indexed
+    specialist/location queries, so the filters never scan the table.
+    """
+
+    def __init__(self, cities):
+        from sklearn.neighbors import BallTree
+
+        self.cities = [city for city in cities if city.strip().lower() in city_coordinates]
+        points = [city_coordinates[city.strip().lower()] for city in self.cities]
+        self._tree = BallTree(np.array(points).reshape(-1, 2), metric="haversine")
+
+    def within(self, origin, radius_km):
+        """(city, distance km) pairs within radius_km of origin, nearest first"""
+        if not self.cities:
+            return []
+        indices, distances = self._tree.query_radius([origin], r=radius_km / EARTH_RADIUS_KM,
+                                                     return_distance=True, sort_results=True)
+        return [(self.cities[i], d * EARTH_RADIUS_KM) for i, d in zip(indices[0], distances[0])]
+
+    def nearest(self, origin, k):
+        """The k cities closest to origin as (city, distance km), nearest first"""
+        k = min(k, len(self.cities))
+        if not k:
+            return []
+        distances, indices = self._tree.query([origin], k=k)
+        return [(self.cities[i], d * EARTH_RADIUS_KM) for i, d in zip(indices[0], distances[0])]
+
+
+_city_index = (None, None)
+_city_index_lock = threading.Lock()
+
+def get_city_index(dataset=None):
+    # Built on first use, since importing scikit-learn is too slow for app
+    # startup, and again for each new doctor data version
+    global _city_index
+    dataset = dataset or current_dataset()
+    version, index = _city_index
+    if version != dataset.version:
+        with _city_index_lock:
+            version, index = _city_index
+            if version != dataset.version:
+                index = CityIndex(list(dataset.value_counts("Location").index))
+                _city_index = (dataset.version, index)
+    return index
+
+def nearby_cities(place, radius_km=PROXIMITY_RADIUS_KM, dataset=None):
+    """Names of the doctors' cities within radius_km of place, nearest first
+
+    An unknown place, or one given by name but without doctors nearby,
+    falls back to the place name itself, so exact matches still count.
+    """
+    origin = locate(place)
+    cities = [] if origin is None else [city for city, _ in get_city_index(dataset).within(origin, radius_km)]
+    if isinstance(place, str) and place.strip().lower() not in {city.strip().lower() for city in cities}:
+        cities.append(place)
+    return cities
+
+def _doctors_in(dataset, cities, specialist, min_experience, min_rating, limit=None):
+    frames = []
+    found = 0
+    for city, distance in cities:
+        doctors = dataset.query(specialist, city, min_experience, min_rating)
+        if len(doctors):
+            frames.append(doctors.assign(Distance=distance))
+            found += len(doctors)
+            if limit is not None and found >= limit:
+                break
+    if not frames:
+        return pd.DataFrame(columns=["Name", "Specialist", "Location", "Experience", "Contact", "Rating", "Distance"])
+    return pd.concat(frames).iloc[:limit]
+
+def doctors_within(specialist, place, radius_km, min_experience=0, min_rating=None):
+    """Doctors within radius_km of a city or (lat, lon), nearest city first
+
+    Within a city, doctors keep get_doctors_by_specialist's order. Each
+    row gains a Distance column in km. An unknown place matches nothing.
+    """
+    dataset = current_dataset()
+    origin = locate(place)
+    if origin is None:
+        return _doctors_in(dataset, [], specialist, min_experience, min_rating)
+    cities = get_city_index(dataset).within(origin, radius_km)
+    return _doctors_in(dataset, cities, specialist, min_experience, min_rating)
+
+def nearest_doctors(specialist, place, k, min_experience=0, min_rating=None):
+    """The k matching doctors closest to a city or (lat, lon), with a Distance column"""
+    dataset = current_dataset()
+    origin = locate(place)
+    if origin is None:
+        return _doctors_in(dataset, [], specialist, min_experience, min_rating)
+    index = get_city_index(dataset)
+    n_cities = 1
+    while True:
+        # Widen the city search until k doctors turn up or every city is covered
+        cities = index.nearest(origin, n_cities)
+        doctors = _doctors_in(dataset, cities, specialist, min_experience, min_rating, limit=k)
+        if len(doctors) >= k or n_cities >= len(index.cities):
+            return doctors
+        n_cities *= 2
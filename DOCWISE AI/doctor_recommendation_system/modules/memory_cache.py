@@ -0,0 +1,77 @@
+# modules/memory_cache.py
+
+import threading
+import time
+from collections import OrderedDict
+
+_MISS = object()
+
+class LRUCache:
+    """Bounded in-process LRU cache with a TTL and a data version
+
+    Entries expire ``ttl_seconds`` after they were stored, and the least
+    recently used entry is dropped once ``max_entries`` is reached. Every
+    call names the (increasing) version of the data it is based on; a
+    newer version empties the whole cache first, so no entry computed
+    from older data is ever returned, and values computed from an older
+    version than the cache holds are not stored.
+    """
+
+    def __init__(self, max_entries, ttl_seconds, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _check_version(self, version):
+        # Caller holds _lock; False when version is older than the cached data
+        if self.version is not None and version < self.version:
+            return False
+        if version != self.version:
+            self._entries.clear()
+            self.version = version
+        return True
+
+    def get(self, key, version, default=None):
+        with self._lock:
+            entry = self._entries.get(key, _MISS) if self._check_version(version) else _MISS
+            if entry is not _MISS and entry[0] <= self.clock():
+                del self._entries[key]
+                entry = _MISS
+            if entry is _MISS:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, version):
+        with self._lock:
+            if not self._check_version(version):
+                return
+            self._entries[key] = (self.clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, key, version, compute):
+        """Cached value for key, or compute() stored under version on a miss"""
+        value = self.get(key, version, _MISS)
+        if value is _MISS:
+            value = compute()
+            self.set(key, value, version)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            hits, misses, size = self.hits, self.misses, len(self._entries)
+        total = hits + misses
+        return {"hits": hits, "misses": misses, "hit_rate": hits / total if total else 0.0, "size": size}
@@ -0,0 +1,84 @@
+# modules/ocr.py
+
+import hashlib
+import io
+import os
+
+import pytesseract
+from PIL import Image
+
+from modules.disk_cache import DiskCache
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OCR_CACHE_DIR = os.path.join(BASE_DIR, "cache", "ocr")
+OCR_CACHE_MAX_BYTES = 20 * 1024 * 1024
+
+# Images are rescaled to roughly this resolution before Tesseract sees them
+OCR_TARGET_DPI = 300
+MIN_SCALE, MAX_SCALE = 0.25, 2.0
+
+# Anything smaller than this (in source pixels) is an icon or rule, not text
+MIN_OCR_SIDE = 24
+MIN_OCR_PIXELS = 10000
+
+# Bump when preprocessing changes so cached OCR text is recomputed
+OCR_PIPELINE_VERSION = 1
+
+ocr_cache = DiskCache(OCR_CACHE_DIR, OCR_CACHE_MAX_BYTES)
+
+def image_digest(image_bytes):
+    return hashlib.sha1(image_bytes).hexdigest()
+
+def is_too_small(width, height):
+    return min(width, height) < MIN_OCR_SIDE or width * height < MIN_OCR_PIXELS
+
+def dpi_scale(width_px, display_width_pt):
+    """Resize factor that brings an image drawn display_width_pt wide to OCR_TARGET_DPI"""
+    if not display_width_pt:
+        return 1.0
+    dpi = width_px / (display_width_pt / 72.0)
+    scale = min(MAX_SCALE, max(MIN_SCALE, OCR_TARGET_DPI / dpi))
+    # Close enough is left alone; resampling costs more than it gains
+    return 1.0 if abs(scale - 1.0) < 0.1 else round(scale, 2)
+
+def preprocess(image_bytes, scale=1.0):
+    """Grayscale, rescale and Otsu-binarize an image for Tesseract"""
+    import cv2
+    import numpy as np
+
+    gray = np.asarray(Image.open(io.BytesIO(image_bytes)).convert("L"))
+    if scale != 1.0:
+        interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_CUBIC
+        gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=interpolation)
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return binary
+
+def ocr_image(image_bytes, scale=1.0, digest=None):
+    """OCR text for one image, cached on disk by content hash"""
+    digest = digest or image_digest(image_bytes)
+    key = f"{digest}-{scale}-v{OCR_PIPELINE_VERSION}"
+    return ocr_cache.get_or_compute(
+        key, lambda: pytesseract.image_to_string(preprocess(image_bytes, scale))
+    )
+
+def ocr_page_images(doc, page, xref_digests):
+    """OCR the images on a text-less page as a list of (digest, text)
+
+    Images too small to hold text are skipped. ``xref_digests`` maps the
+    xrefs already handled in this document to their (digest, text), so a
+    logo repeated on every page is extracted and OCR-ed once; callers drop
+    repeated digests when joining the text.
+    """
+    results = []
+    for img in page.get_images(full=True):
+        xref, width, height = img[0], img[2], img[3]
+        if is_too_small(width, height):
+            continue
+        if xref not in xref_digests:
+            image_bytes = doc.extract_image(xref)["image"]
+            digest = image_digest(image_bytes)
+            rects = page.get_image_rects(xref)
+            scale = dpi_scale(width, rects[0].width if rects else None)
+            xref_digests[xref] = (digest, ocr_image(image_bytes, scale, digest))
+        results.append(xref_digests[xref])
+    return results
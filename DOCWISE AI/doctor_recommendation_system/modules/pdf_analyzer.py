@@ -1,15 +1,179 @@
 # modules/pdf_analyzer.py
 
 import fitz  # PyMuPDF
-from transformers import pipeline
-import pytesseract
-from PIL import Image
-import io
-import spacy
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
-# Load models once
-summarizer = pipeline("summarization", model="sshleifer/distilbart-cnn-12-6", device=-1)
-nlp = spacy.load("en_core_web_sm")
+from modules.disease_mapper import ALIASES_PATH, CSV_PATH, resolve_condition
+from modules.disease_scoring import (
+    EXTRACTED_SYMPTOM_WEIGHT, TEXT_SYMPTOM_WEIGHT, DiseaseScorer
+)
+from modules.disk_cache import DiskCache
+from modules import ocr
+from modules.ocr import ocr_page_images
+from modules.term_index import TermIndex
+
+logger = logging.getLogger(__name__)
+
+SUMMARIZER_MODEL = "sshleifer/distilbart-cnn-12-6"
+SPACY_MODEL = "en_core_web_sm"
+
+# How much of spaCy symptom extraction loads; it only needs sentence bounds:
+#   "full"   - the whole en_core_web_sm pipeline (tagger, parser, NER)
+#   "senter" - en_core_web_sm's statistical sentence recognizer only
+#   "rule"   - a blank English pipeline with the punctuation sentencizer
+NLP_MODE = "senter"
+NLP_MODES = ("full", "senter", "rule")
+
+# Chunks sent through the summarizer per padded batch
+SUMMARY_BATCH_SIZE = 4
+
+# Tokens per summarizer input chunk (None = the model window) and tokens
+# shared by consecutive chunks
+SUMMARY_CHUNK_TOKENS = None
+SUMMARY_CHUNK_OVERLAP = 0
+# Tokens of the model window kept free by default: a chunk re-tokenized on
+# its own can come out a few tokens longer than its count in context
+SUMMARY_CHUNK_MARGIN = 16
+# Characters per token assumed when sizing the text window tokenized per chunk
+CHARS_PER_TOKEN_GUESS = 6
+
+# Map-reduce summarization: levels of reduction (1 = no reduce rounds) and
+# an optional cap on the tokens read from one document (None = no cap)
+SUMMARY_MAX_DEPTH = 4
+SUMMARY_TOKEN_BUDGET = None
+
+# Characters of report text given to the symptom/disease extraction
+ANALYSIS_CHAR_LIMIT = 10000
+
+# Bump whenever a change alters analysis output, so cached results expire
+ANALYSIS_CONFIG_VERSION = 8
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ANALYSIS_CACHE_DIR = os.path.join(BASE_DIR, "cache", "analysis")
+ANALYSIS_CACHE_MAX_BYTES = 100 * 1024 * 1024
+
+analysis_cache = DiskCache(ANALYSIS_CACHE_DIR, ANALYSIS_CACHE_MAX_BYTES)
+
+# Summaries of single chunks, shared across reports: boilerplate such as
+# disclaimers and reference ranges is only summarized the first time
+CHUNK_SUMMARY_CACHE_DIR = os.path.join(BASE_DIR, "cache", "chunk_summaries")
+CHUNK_SUMMARY_CACHE_MAX_BYTES = 20 * 1024 * 1024
+
+chunk_summary_cache = DiskCache(CHUNK_SUMMARY_CACHE_DIR, CHUNK_SUMMARY_CACHE_MAX_BYTES)
+
+# Text/OCR extraction fans page ranges out to this many processes once a
+# document has at least PARALLEL_MIN_PAGES pages (1 = always serial)
+EXTRACTION_WORKERS = min(4, os.cpu_count() or 1)
+PARALLEL_MIN_PAGES = 16
+PAGES_PER_RANGE = 8
+
+class LazyModel:
+    """Builds a model on first use; safe to share between threads"""
+
+    def __init__(self, name, loader):
+        self.name = name
+        self.load_seconds = None
+        self._loader = loader
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._model is not None
+
+    def get(self):
+        model = self._model
+        if model is None:
+            with self._lock:
+                if self._model is None:
+                    start = time.perf_counter()
+                    self._model = self._loader()
+                    self.load_seconds = time.perf_counter() - start
+                model = self._model
+        return model
+
+def _load_summarizer():
+    # torch/transformers are only imported when a summary is first needed
+    from transformers import pipeline
+    return pipeline("summarization", model=SUMMARIZER_MODEL, device=-1)
+
+def _load_nlp(mode=None):
+    import spacy
+    mode = mode or NLP_MODE
+    if mode == "full":
+        return spacy.load(SPACY_MODEL)
+    if mode == "senter":
+        nlp = spacy.load(SPACY_MODEL, exclude=["tok2vec", "tagger", "parser", "attribute_ruler",
+                                               "lemmatizer", "ner"])
+        nlp.enable_pipe("senter")
+        return nlp
+    if mode == "rule":
+        nlp = spacy.blank("en")
+        nlp.add_pipe("sentencizer")
+        return nlp
+    raise ValueError(f"Unknown NLP mode {mode!r}; expected one of {NLP_MODES}")
+
+# Models load on first use instead of at import time
+summarizer_model = LazyModel("summarizer", _load_summarizer)
+nlp_model = LazyModel("spacy", _load_nlp)
+
+def set_nlp_mode(mode):
+    """Switch the spaCy pipeline used for symptom extraction (loaded lazily)"""
+    global NLP_MODE, nlp_model
+    if mode not in NLP_MODES:
+        raise ValueError(f"Unknown NLP mode {mode!r}; expected one of {NLP_MODES}")
+    NLP_MODE = mode
+    nlp_model = LazyModel("spacy", _load_nlp)
+
+_warm_up_thread = None
+_warm_up_lock = threading.Lock()
+
+def warm_up(background=True):
+    """Load the models ahead of the first analysis
+
+    With ``background=True`` loading happens on a daemon thread and the
+    thread is returned; repeated calls reuse the first one. Load errors
+    are left for the first real analysis to report.
+    """
+    global _warm_up_thread
+
+    def load_all():
+        try:
+            nlp_model.get()
+            summarizer_model.get()
+        except Exception:
+            pass
+
+    if not background:
+        nlp_model.get()
+        summarizer_model.get()
+        return None
+
+    with _warm_up_lock:
+        if _warm_up_thread is None:
+            _warm_up_thread = threading.Thread(target=load_all, name="model-warm-up", daemon=True)
+            _warm_up_thread.start()
+        return _warm_up_thread
+
+def __getattr__(name):
+    # Keep `pdf_analyzer.summarizer` / `pdf_analyzer.nlp` working for callers
+    if name == "summarizer":
+        return summarizer_model.get()
+    if name == "nlp":
+        return nlp_model.get()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 MEDICAL_KEYWORDS = [
     "patient", "diagnosis", "treatment", "prescription", "medical history",
@@ -17,115 +181,509 @@ MEDICAL_KEYWORDS = [
     "doctor", "hospital", "medication", "prognosis", "allergy", "dose"
 ]
 
-DISEASE_SYMPTOMS = {
-    "diabetes": ["thirst", "urination", "fatigue", "blurred vision", "weight loss"],
-    "hypertension": ["headache", "dizziness", "blurred vision", "shortness of breath"],
-    "asthma": ["wheezing", "shortness of breath", "coughing", "chest tightness"],
-    "influenza": ["fever", "cough", "sore throat", "runny nose", "body aches"],
-    "pneumonia": ["cough", "fever", "chills", "shortness of breath", "chest pain"],
-    "coronary artery disease": ["chest pain", "shortness of breath", "heart attack"],
-    "arthritis": ["joint pain", "stiffness", "swelling", "decreased range of motion"],
-    "migraine": ["headache", "nausea", "sensitivity to light", "aura"],
-    "gastroenteritis": ["diarrhea", "nausea", "vomiting", "abdominal pain", "fever"],
-    "urinary tract infection": ["burning urination", "frequent urination", "pelvic pain"]
-}
+# Disease knowledge: which symptoms point to which disease, and how strongly
+DISEASE_SYMPTOMS_PATH = os.path.join(BASE_DIR, "data", "disease_symptoms.csv")
+disease_scorer = DiseaseScorer.from_csv(DISEASE_SYMPTOMS_PATH)
+
+SYMPTOM_PATTERNS = [
+    "pain", "ache", "sore", "tenderness", "discomfort", "fever", "nausea",
+    "vomiting", "dizziness", "fatigue", "weakness", "cough", "headache",
+    "rash", "swelling", "bleeding", "bruising", "shortness of breath",
+    "wheezing", "chills", "sweating", "palpitations", "numbness", "tingling"
+]
+
+SEVERE_SYMPTOMS = [
+    "chest pain", "shortness of breath", "severe bleeding", 
+    "loss of consciousness", "difficulty breathing", "severe headache"
+]
+
+# Every term the analysis looks for, compiled into one automaton
+VOCABULARY = TermIndex({
+    "keyword": MEDICAL_KEYWORDS,
+    "symptom": SYMPTOM_PATTERNS,
+    "disease": disease_scorer.diseases,
+    "disease_symptom": disease_scorer.symptoms,
+    "severe": SEVERE_SYMPTOMS,
+})
+
+class AnalysisCancelled(Exception):
+    """Raised inside summarize_pdf when its cancel_event is set"""
+
+def _report(progress, cancel_event, stage, current=None, total=None):
+    # Cancellation is checked at every stage boundary
+    if cancel_event is not None and cancel_event.is_set():
+        raise AnalysisCancelled()
+    if progress is not None:
+        progress(stage, current, total)
+
+# A slice of the source text: its [start, end) offsets and token count
+# (None when chunked by characters)
+TextChunk = namedtuple("TextChunk", ["text", "start", "end", "tokens"])
+
+def _iter_char_chunks(text, max_chunk_size):
+    # Splits exactly where the old copy-the-remainder loop did, walking offsets instead
+    start = 0
+    while len(text) - start > max_chunk_size:
+        split_index = text.rfind(".", start, start + max_chunk_size)
+        end = split_index + 1 if split_index != -1 else start + max_chunk_size + 1
+        yield TextChunk(text[start:end], start, end, None)
+        start = end
+    if start < len(text):
+        yield TextChunk(text[start:], start, len(text), None)
+
+def _token_offsets(tokenizer, text):
+    # Character span of every token, or None when the tokenizer cannot report them
+    try:
+        encoding = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)
+        return list(encoding["offset_mapping"])
+    except (NotImplementedError, KeyError, TypeError, ValueError):
+        return None
+
+_SENTENCE_END = re.compile(r"[.!?](?=\s|$)")
+
+def _window_tokens(tokenizer, text, start, max_tokens):
+    """Absolute (start, end) offsets of the tokens from start on, or None
+
+    Only a window of text is tokenized: enough characters for more than
+    max_tokens tokens, widened only when it holds too few tokens. Tokens
+    of the word cut by the window's edge are dropped, as they may split
+    differently in the full text; with no whitespace to cut at (one long
+    word, or a script written without spaces) just the last token is.
+    """
+    size = CHARS_PER_TOKEN_GUESS * (max_tokens + 1)
+    while True:
+        stop = min(start + size, len(text))
+        offsets = _token_offsets(tokenizer, text[start:stop])
+        if offsets is None:
+            return None
+        offsets = [(start + begin, start + end) for begin, end in offsets]
+        if stop == len(text):
+            return offsets
+        edge = stop - 1
+        while edge > start and not text[edge].isspace():
+            edge -= 1
+        whole = [span for span in offsets if span[1] <= edge]
+        if len(whole) > max_tokens:
+            return whole
+        if len(offsets) > max_tokens + 1:
+            return offsets[:-1]
+        size *= 2
+
+def iter_chunks(text, tokenizer=None, max_tokens=None, overlap=0, max_chunk_size=900):
+    """Yield TextChunks covering text in one pass, without copying the remainder
+
+    With a tokenizer, each chunk holds at most ``max_tokens`` tokens
+    (default: the model window less SUMMARY_CHUNK_MARGIN), ending at the
+    last sentence break inside that span when one falls in its second
+    half; consecutive chunks share ``overlap`` tokens. Each chunk is
+    tokenized from its own start within a bounded window of text, so
+    memory does not grow with the document. Without a tokenizer (or
+    when it cannot map tokens back to offsets), chunks are cut by
+    ``max_chunk_size`` characters as chunk_text always did.
+    """
+    if tokenizer is None:
+        yield from _iter_char_chunks(text, max_chunk_size)
+        return
+    max_tokens = max(1, max_tokens or _model_window(tokenizer) - SUMMARY_CHUNK_MARGIN)
+    overlap = min(max(0, overlap), max_tokens - 1)
+
+    position = 0
+    while position < len(text):
+        offsets = _window_tokens(tokenizer, text, position, max_tokens)
+        if offsets is None:
+            # Known from the first window, before anything was yielded
+            yield from _iter_char_chunks(text, max_chunk_size)
+            return
+        if not offsets:
+            return
+        last = min(max_tokens, len(offsets))
+        if last < len(offsets):
+            # Prefer ending on a sentence, unless that would leave the chunk under half full
+            token_ends = [end for _, end in offsets]
+            # One character past the span, so the lookahead sees what follows a stop
+            sentence_ends = [m.end() for m in _SENTENCE_END.finditer(text, offsets[0][0], token_ends[last - 1] + 1)]
+            if sentence_ends:
+                cut = bisect_right(token_ends, sentence_ends[-1], 0, last)
+                if cut >= max_tokens // 2:
+                    last = cut
+        start, end = offsets[0][0], offsets[last - 1][1]
+        yield TextChunk(text[start:end], start, end, last)
+        if last == len(offsets):
+            return
+        # The next window starts at the first overlapping token, always moving forward
+        following = offsets[max(last - overlap, 1)][0]
+        position = following if following > position else max(end, position + 1)
 
 def chunk_text(text, max_chunk_size=900):
-    chunks = []
-    while len(text) > max_chunk_size:
-        split_index = text.rfind(".", 0, max_chunk_size)
-        if split_index == -1:
-            split_index = max_chunk_size
-        chunks.append(text[:split_index + 1])
-        text = text[split_index + 1:]
-    if text:
-        chunks.append(text)
-    return chunks
-
-def is_medical(text):
-    count = sum(1 for kw in MEDICAL_KEYWORDS if kw.lower() in text.lower())
-    return count >= 2
-
-def extract_text_from_pdf(file_bytes):
-    doc = fitz.open("pdf", file_bytes)
-    text = ""
-    for page in doc:
-        page_text = page.get_text()
-        if page_text.strip():
-            text += page_text
-        else:
-            for img in page.get_images(full=True):
-                xref = img[0]
-                base_image = doc.extract_image(xref)
-                image_bytes = base_image["image"]
-                image = Image.open(io.BytesIO(image_bytes))
-                text += pytesseract.image_to_string(image)
-    return text
-
-def extract_symptoms(text):
+    return [chunk.text for chunk in _iter_char_chunks(text, max_chunk_size)]
+
+def chunk_summary_key(chunk, max_length, min_length):
+    """Hash of the whitespace-normalized chunk plus the model and generation settings"""
+    digest = hashlib.sha256(" ".join(chunk.split()).encode("utf-8"))
+    params = {"model": SUMMARIZER_MODEL, "max_length": max_length, "min_length": min_length}
+    digest.update(json.dumps(params, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+def summarize_chunks(chunks, batch_size=SUMMARY_BATCH_SIZE, max_length=120, min_length=40,
+                     progress=None, cancel_event=None, timings=None, cache=chunk_summary_cache,
+                     failures=None):
+    """Summarize chunks through the pipeline as padded batches
+
+    Chunks already in ``cache`` (None to bypass it) are answered from
+    it, and repeats within the call are summarized once; only the rest
+    reach the model. A batch that raises is retried one chunk at a time,
+    so a bad chunk only loses its own summary ("Chunk processing error:
+    ..."), which is never cached and is also appended to ``failures``
+    when a list is given. ``(batch_len, seconds)`` for every batch is
+    logged and appended to ``timings`` when a list is given.
+    """
+    batch_size = max(1, batch_size)
+    if cache is not None:
+        keys = [chunk_summary_key(chunk, max_length, min_length) for chunk in chunks]
+    else:
+        keys = list(range(len(chunks)))
+    texts = {}
+    for key, chunk in zip(keys, chunks):
+        texts.setdefault(key, chunk)
+    found = {key: cache.get(key) for key in texts} if cache is not None else {}
+    misses = [key for key in texts if found.get(key) is None]
+    if cache is not None and chunks:
+        logger.info("%d of %d chunk(s) served from the summary cache", len(chunks) - len(misses), len(chunks))
+    # Loaded only when something is left for the model
+    summarizer = summarizer_model.get() if misses else None
+
+    for start in range(0, len(misses), batch_size):
+        batch_keys = misses[start:start + batch_size]
+        batch = [texts[key] for key in batch_keys]
+        _report(progress, cancel_event, "summarizing", start + len(batch), len(misses))
+        began = time.perf_counter()
+        fresh = {}
+        try:
+            # Truncation guards against a chunk that re-tokenizes past the model window
+            outputs = summarizer(batch, max_length=max_length, min_length=min_length,
+                                 do_sample=False, batch_size=len(batch), truncation=True)
+            fresh.update(zip(batch_keys, (output["summary_text"] for output in outputs)))
+        except Exception:
+            for key, chunk in zip(batch_keys, batch):
+                try:
+                    summary = summarizer(chunk, max_length=max_length, min_length=min_length,
+                                         do_sample=False, truncation=True)
+                    fresh[key] = summary[0]["summary_text"]
+                except Exception as e:
+                    found[key] = f"Chunk processing error: {str(e)}"
+                    if failures is not None:
+                        failures.append(found[key])
+        found.update(fresh)
+        if cache is not None and fresh:
+            cache.set_many(fresh.items())
+        elapsed = time.perf_counter() - began
+        logger.info("Summarized batch of %d chunk(s) in %.2fs (%.2f chunks/s)",
+                    len(batch), elapsed, len(batch) / elapsed if elapsed else 0.0)
+        if timings is not None:
+            timings.append((len(batch), elapsed))
+    return [found[key] for key in keys]
+
+def _model_window(tokenizer):
+    # Some tokenizers report a huge sentinel instead of the real limit
+    window = getattr(tokenizer, "model_max_length", 1024) or 1024
+    return min(window, 1024) - 2  # room for <s> and </s>
+
+def _count_tokens(tokenizer, text):
+    return len(tokenizer(text, add_special_tokens=False)["input_ids"])
+
+class _SummaryTree:
+    """Pending summaries per reduction level, each kept under the model window
+
+    When a level would overflow it is joined and summarized into one entry
+    on the next level up, so memory depends on depth, not document length.
+    Only the top level (``max_depth - 1``) may grow past the window; the
+    final pass truncates it.
+    """
+
+    def __init__(self, reduce, count_tokens, window, max_depth):
+        self.reduce = reduce
+        self.count_tokens = count_tokens
+        self.window = window
+        self.max_depth = max(1, max_depth)
+        self.levels = [[] for _ in range(self.max_depth)]
+        self.level_tokens = [0] * self.max_depth
+
+    def push(self, summary, depth=0):
+        tokens = self.count_tokens(summary)
+        top = depth == self.max_depth - 1
+        if not top and self.levels[depth] and self.level_tokens[depth] + tokens > self.window:
+            self._flush(depth)
+        self.levels[depth].append(summary)
+        self.level_tokens[depth] += tokens
+
+    def _flush(self, depth):
+        joined = " ".join(self.levels[depth])
+        self.levels[depth] = []
+        self.level_tokens[depth] = 0
+        self.push(self.reduce(joined, depth + 1), depth + 1)
+
+    def collapse(self):
+        """Reduce until a single level holds everything; return its text"""
+        while True:
+            filled = [depth for depth, items in enumerate(self.levels) if items]
+            if len(filled) <= 1:
+                break
+            self._flush(filled[0])
+        return " ".join(self.levels[filled[0]]) if filled else ""
+
+def summarize_text(text, batch_size=SUMMARY_BATCH_SIZE, max_depth=SUMMARY_MAX_DEPTH,
+                   token_budget=SUMMARY_TOKEN_BUDGET, progress=None, cancel_event=None, failures=None):
+    """Hierarchical map-reduce summary of the whole text
+
+    Every chunk is summarized (map), chunk summaries are folded level by
+    level into summaries that fit the model window (reduce), and the last
+    level gets the final 200-token pass. Reading stops once
+    ``token_budget`` input tokens have been mapped. Every chunk or pass
+    the model failed on is appended to ``failures`` when a list is given.
+    """
+    summarizer = summarizer_model.get()
+    tokenizer = summarizer.tokenizer
+    window = _model_window(tokenizer)
+
+    def reduce(joined, depth):
+        _report(progress, cancel_event, "reducing", depth, max_depth - 1)
+        # Joined summaries never recur across reports, so they bypass the chunk cache
+        return summarize_chunks([joined], batch_size=1, cache=None, failures=failures)[0]
+
+    tree = _SummaryTree(reduce, lambda t: _count_tokens(tokenizer, t), window, max_depth)
+
+    chunks = iter_chunks(text, tokenizer, max_tokens=SUMMARY_CHUNK_TOKENS, overlap=SUMMARY_CHUNK_OVERLAP)
+    used_tokens = 0
+    batch = []
+    mapped_to = 0
+    for i, chunk in enumerate(chunks, 1):
+        if token_budget is not None:
+            used_tokens += chunk.tokens if chunk.tokens is not None else _count_tokens(tokenizer, chunk.text)
+            if used_tokens > token_budget:
+                logger.warning("Token budget of %d reached; summarized %d chunks, %d of %d characters",
+                               token_budget, i - 1, mapped_to, len(text))
+                break
+        batch.append(chunk.text)
+        mapped_to = chunk.end
+        if len(batch) == batch_size:
+            # Chunks come lazily, so progress is the share of the text mapped so far
+            _report(progress, cancel_event, "summarizing", round(100 * mapped_to / len(text)), 100)
+            for summary in summarize_chunks(batch, batch_size=batch_size, cancel_event=cancel_event,
+                                            failures=failures):
+                tree.push(summary)
+            batch = []
+    # The last partial batch, or chunks left over when the token budget cut the loop short
+    if batch:
+        _report(progress, cancel_event, "summarizing", round(100 * mapped_to / len(text)), 100)
+    for summary in summarize_chunks(batch, batch_size=batch_size, cancel_event=cancel_event,
+                                    failures=failures):
+        tree.push(summary)
+
+    combined_text = tree.collapse()
+    if not combined_text:
+        return "Unable to generate detailed summary from document content."
+
+    _report(progress, cancel_event, "final")
+    try:
+        final_summary = summarizer(combined_text, max_length=200, min_length=50, do_sample=False, truncation=True)
+        return final_summary[0]["summary_text"]
+    except Exception as e:
+        if failures is not None:
+            failures.append(f"Final summary error: {str(e)}")
+        return "Summary generation incomplete due to processing limitations."
+
+def is_medical(text, matches=None):
+    # ``matches`` may be passed in when VOCABULARY.scan(text.lower()) was already run
+    if matches is None:
+        matches = VOCABULARY.scan(text.lower())
+    return len(matches.found("keyword")) >= 2
+
+def _extract_page_range(source, start, stop):
+    """Pages [start, stop) of PDF bytes or a PDF path, as page text or (digest, text) lists for OCR-ed pages"""
+    pages = []
+    xref_digests = {}
+    with (fitz.open("pdf", source) if isinstance(source, bytes) else fitz.open(source)) as doc:
+        for page_number in range(start, stop):
+            page = doc[page_number]
+            page_text = page.get_text()
+            if page_text.strip():
+                pages.append(page_text)
+            else:
+                pages.append(ocr_page_images(doc, page, xref_digests))
+    return pages
+
+def _merge_pages(pages):
+    # Repeated images (letterheads, logos) contribute their text only once
+    parts = []
+    seen_digests = set()
+    for page in pages:
+        if isinstance(page, str):
+            parts.append(page)
+            continue
+        for digest, text in page:
+            if digest not in seen_digests:
+                seen_digests.add(digest)
+                parts.append(text)
+    return "".join(parts)
+
+_extraction_pool = (0, None)
+_extraction_pool_lock = threading.Lock()
+
+def _get_extraction_pool(workers):
+    # One pool for the life of the process, rebuilt only when the worker
+    # count changes. Workers are spawned, not forked: callers may be running
+    # torch and warm-up threads, and forking a multithreaded process can
+    # deadlock.
+    global _extraction_pool
+    with _extraction_pool_lock:
+        size, pool = _extraction_pool
+        if pool is None or size != workers:
+            if pool is not None:
+                pool.shutdown(wait=False)
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _extraction_pool = (workers, pool)
+        return pool
+
+def _reset_extraction_pool(pool):
+    global _extraction_pool
+    with _extraction_pool_lock:
+        if _extraction_pool[1] is pool:
+            _extraction_pool = (0, None)
+    pool.shutdown(wait=False)
+
+def extract_text_from_pdf(file_bytes, workers=None):
+    """Extract the document text, in page order
+
+    Large documents are split into page ranges that are extracted in a
+    shared process pool (each worker opens the PDF from a temporary file);
+    the merged text is identical to the serial path.
+    """
+    workers = EXTRACTION_WORKERS if workers is None else workers
+    with fitz.open("pdf", file_bytes) as doc:
+        page_count = doc.page_count
+
+    if workers <= 1 or page_count < PARALLEL_MIN_PAGES:
+        return _merge_pages(_extract_page_range(file_bytes, 0, page_count))
+
+    ranges = [(start, min(start + PAGES_PER_RANGE, page_count))
+              for start in range(0, page_count, PAGES_PER_RANGE)]
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(file_bytes)
+        pool = _get_extraction_pool(workers)
+        try:
+            futures = [pool.submit(_extract_page_range, path, start, stop) for start, stop in ranges]
+            return _merge_pages(page for future in futures for page in future.result())
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); start a fresh pool next time
+            logger.warning("Extraction pool broke; extracting %d pages serially", page_count)
+            _reset_extraction_pool(pool)
+            return _merge_pages(_extract_page_range(file_bytes, 0, page_count))
+    finally:
+        os.remove(path)
+
+def extract_symptoms(text, matches=None):
+    text_lower = text.lower()
+    doc = nlp_model.get()(text_lower)
+    if matches is None:
+        matches = VOCABULARY.scan(text_lower)
+    return _symptoms_from_doc(doc, matches)
+
+def extract_symptoms_batch(texts, batch_size=32, n_process=1):
+    """extract_symptoms for many documents, streamed through nlp.pipe"""
+    lowered = [text.lower() for text in texts]
+    docs = nlp_model.get().pipe(lowered, batch_size=batch_size, n_process=n_process)
+    return [_symptoms_from_doc(doc, VOCABULARY.scan(text_lower))
+            for doc, text_lower in zip(docs, lowered)]
+
+def _symptoms_from_doc(doc, matches):
     symptoms = []
-    doc = nlp(text.lower())
-    
-    # Enhanced symptom extraction
-    symptom_patterns = [
-        "pain", "ache", "sore", "tenderness", "discomfort", "fever", "nausea",
-        "vomiting", "dizziness", "fatigue", "weakness", "cough", "headache",
-        "rash", "swelling", "bleeding", "bruising", "shortness of breath",
-        "wheezing", "chills", "sweating", "palpitations", "numbness", "tingling"
-    ]
     
     for sent in doc.sents:
-        sent_text = sent.text.lower()
-        for symptom in symptom_patterns:
-            if symptom in sent_text:
-                # Extract context around the symptom
-                words = sent_text.split()
-                if symptom in words:
-                    index = words.index(symptom)
-                    start = max(0, index - 2)
-                    end = min(len(words), index + 3)
-                    context = " ".join(words[start:end])
-                    if context not in symptoms:
-                        symptoms.append(context)
+        hits = matches.between(sent.start_char, sent.end_char, "symptom")
+        if not hits:
+            continue
+        # Extract context around the symptom, two words either side
+        sent_text = sent.text
+        word_spans = [(m.start(), m.end()) for m in re.finditer(r"\S+", sent_text)]
+        words = [sent_text[start:end] for start, end in word_spans]
+        word_ends = [end for _, end in word_spans]
+        for start, end, symptom in hits:
+            # Whole words only, so "ache" is not read in "headache" nor "pain" in "painless"
+            if not _is_whole_word(doc.text, start, end):
+                continue
+            first = bisect_left(word_ends, start - sent.start_char + 1)
+            last = bisect_left(word_ends, end - sent.start_char)
+            context = " ".join(words[max(0, first - 2):last + 3])
+            if context not in symptoms:
+                symptoms.append(context)
     
     return list(set(symptoms))[:10]  # Limit to top 10 symptoms
 
-def predict_disease(symptoms, text):
-    disease_scores = {}
-    text_lower = text.lower()
-    
-    for disease, disease_syms in DISEASE_SYMPTOMS.items():
-        score = 0
-        # Score based on symptoms
-        for symptom in symptoms:
-            for ds in disease_syms:
-                if ds in symptom:
-                    score += 2
-        
-        # Score based on disease mentions in text
-        if disease in text_lower:
-            score += 3
-        
-        # Score based on keyword mentions
-        for ds in disease_syms:
-            if ds in text_lower:
-                score += 1
-        
-        if score > 0:
-            disease_scores[disease] = score
-    
-    return sorted(disease_scores.items(), key=lambda x: x[1], reverse=True)[:3]
+def _is_whole_word(text, start, end):
+    # No letter or digit directly before or after text[start:end]
+    if start > 0 and text[start - 1].isalnum():
+        return False
+    return end >= len(text) or not text[end].isalnum()
+
+def _names_disease(text, start, end):
+    # Whole words only (a trailing plural "s" allowed), so "cold" is not read in "scold"
+    if end < len(text) and text[end] == "s" and _is_whole_word(text, start, end + 1):
+        return True
+    return _is_whole_word(text, start, end)
+
+# Words that negate a disease named right after them in the same clause
+NEGATION_CUES = {"no", "not", "denies", "denied", "without", "negative", "excluded", "ruled"}
+NEGATION_WINDOW_WORDS = 3
+
+def _is_negated(text, start):
+    # "no known allergies", "negative for malaria", "ruled out pneumonia"
+    clause = re.split(r"[.;:!?\n]", text[max(0, start - 60):start])[-1]
+    words = re.findall(r"[a-z]+", clause)[-NEGATION_WINDOW_WORDS:]
+    return any(word in NEGATION_CUES for word in words)
+
+def _disease_evidence(symptoms, text, matches):
+    counts = {}
+    # Each extracted symptom sentence counts once per disease symptom it holds
+    joined = "\n".join(symptoms)
+    symptom_matches = VOCABULARY.scan(joined)
+    start = 0
+    for symptom in symptoms:
+        end = start + len(symptom)
+        for ds in {term for _, _, term in symptom_matches.between(start, end, "disease_symptom")}:
+            counts[ds] = counts.get(ds, 0) + EXTRACTED_SYMPTOM_WEIGHT
+        start = end + 1
+    for ds in matches.found("disease_symptom"):
+        counts[ds] = counts.get(ds, 0) + TEXT_SYMPTOM_WEIGHT
+    mentioned = {term for start, end, term in matches.between(0, len(text), "disease")
+                 if _names_disease(text, start, end) and not _is_negated(text, start)}
+    return counts, mentioned
+
+def predict_disease(symptoms, text, matches=None):
+    if matches is None:
+        matches = VOCABULARY.scan(text.lower())
+    return predict_diseases([(symptoms, text.lower(), matches)])[0]
+
+def predict_diseases(documents, k=3):
+    """Top k (disease, score) per document, for [(symptoms, text_lower, matches or None), ...]
+
+    All documents are scored together by one sparse product against
+    the disease × symptom matrix; ties keep the order of the data file.
+    """
+    evidence = []
+    for symptoms, text_lower, matches in documents:
+        if matches is None:
+            matches = VOCABULARY.scan(text_lower)
+        evidence.append(_disease_evidence(symptoms, text_lower, matches))
+    scores = disease_scorer.score_batch(evidence)
+    return [disease_scorer.top(row, k) for row in scores]
 
 def suggest_actions(diseases, symptoms):
     actions = []
     
     # Emergency symptoms check
-    severe_symptoms = [
-        "chest pain", "shortness of breath", "severe bleeding", 
-        "loss of consciousness", "difficulty breathing", "severe headache"
-    ]
-    
-    if any(severe in symptom for severe in severe_symptoms for symptom in symptoms):
+    if VOCABULARY.scan("\n".join(symptoms)).found("severe"):
         actions.append("🚨 SEEK EMERGENCY MEDICAL ATTENTION IMMEDIATELY")
     
     # Disease-specific recommendations
@@ -145,6 +703,10 @@ def suggest_actions(diseases, symptoms):
     for disease, score in diseases:
         if disease in specialist_mapping:
             actions.append(specialist_mapping[disease])
+        else:
+            match = resolve_condition(disease)
+            if match is not None:
+                actions.append(f"Consult {match[1]} for {match[0]} evaluation")
     
     # General recommendations
     if not actions:
@@ -204,63 +766,128 @@ def format_medical_summary(summary_text, symptoms, diseases, actions):
     
     return formatted_output
 
+def is_cacheable_result(result):
+    # A summary built around model failures is retried on the next open
+    return not result.get("degraded")
+
+def _file_digest(paths):
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+# Data tables the analysis reads: disease symptoms, disease -> specialist and
+# aliases. They are loaded at import, so hashing them then matches what is used.
+ANALYSIS_DATA_FILES = (DISEASE_SYMPTOMS_PATH, CSV_PATH, ALIASES_PATH)
+analysis_data_digest = _file_digest(ANALYSIS_DATA_FILES)
+
+def analysis_cache_key(file_bytes):
+    """Hash of the PDF bytes plus everything that shapes the analysis output"""
+    config = {
+        "version": ANALYSIS_CONFIG_VERSION,
+        "summarizer": SUMMARIZER_MODEL,
+        "spacy": SPACY_MODEL,
+        "nlp_mode": NLP_MODE,
+        "max_depth": SUMMARY_MAX_DEPTH,
+        "token_budget": SUMMARY_TOKEN_BUDGET,
+        "chunk_tokens": SUMMARY_CHUNK_TOKENS,
+        "chunk_overlap": SUMMARY_CHUNK_OVERLAP,
+        "chunk_margin": SUMMARY_CHUNK_MARGIN,
+        "char_limit": ANALYSIS_CHAR_LIMIT,
+        "data": analysis_data_digest,
+        # Which images are OCR'd and how, since their text feeds the analysis
+        "ocr": [ocr.OCR_PIPELINE_VERSION, ocr.OCR_TARGET_DPI, ocr.MIN_SCALE, ocr.MAX_SCALE,
+                ocr.MIN_OCR_SIDE, ocr.MIN_OCR_PIXELS],
+    }
+    digest = hashlib.sha256(file_bytes)
+    digest.update(json.dumps(config, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+def analyze_report(file_bytes, progress=None, cancel_event=None):
+    """Run the full analysis on PDF bytes and return it as a plain dict
+
+    ``status`` is "ok", "no_text" or "not_medical"; only "ok" results carry
+    summary, symptoms, diseases and actions, and ``degraded`` is true when
+    the summarizer failed on part of the report.
+    """
+    # Extract text from PDF
+    _report(progress, cancel_event, "extraction")
+    text = extract_text_from_pdf(file_bytes)
+    if not text.strip():
+        return {"status": "no_text"}
+    
+    # One vocabulary scan serves every keyword/symptom/disease check below
+    text_lower = text.lower()
+    matches = VOCABULARY.scan(text_lower)
+    if not is_medical(text, matches):
+        return {"status": "not_medical"}
+
+    # NLP extraction looks at the start of the report; the summary covers all of it
+    processed_text = text_lower[:ANALYSIS_CHAR_LIMIT]
+    processed_matches = matches.until(len(processed_text))
+    
+    # Extract medical information
+    _report(progress, cancel_event, "symptoms")
+    symptoms = extract_symptoms(processed_text, processed_matches)
+    predicted_diseases = predict_disease(symptoms, processed_text, processed_matches)
+    suggested_actions = suggest_actions(predicted_diseases, symptoms)
+    
+    # Generate summary using map-reduce over every chunk
+    failures = []
+    summary_text = summarize_text(text, progress=progress, cancel_event=cancel_event, failures=failures)
+    if failures:
+        logger.warning("Summary degraded by %d model failure(s); not caching it: %s", len(failures), failures[0])
+
+    return {
+        "status": "ok",
+        "degraded": bool(failures),
+        "summary": summary_text,
+        "symptoms": symptoms,
+        "diseases": [[disease, score] for disease, score in predicted_diseases],
+        "actions": suggested_actions,
+    }
+
 # ✅ Unified entry point
-def summarize_pdf(file_path):
-    """Main function called from App.py (doctor side)"""
+def summarize_pdf(file_path, progress=None, cancel_event=None, use_cache=True):
+    """Main function called from app_ui.py (doctor side)
+
+    ``progress(stage, current, total)`` is called as each stage starts
+    ("extraction", "symptoms", "summarizing" per batch of chunks,
+    "reducing", "final") and setting ``cancel_event`` aborts the run with
+    AnalysisCancelled. Results are cached on disk by content hash, so
+    reopening a report skips OCR and the models entirely.
+    """
     try:
         with open(file_path, "rb") as f:
             file_bytes = f.read()
 
-        # Extract text from PDF
-        text = extract_text_from_pdf(file_bytes)
-        if not text.strip():
+        if use_cache:
+            result = analysis_cache.get_or_compute(
+                analysis_cache_key(file_bytes),
+                lambda: analyze_report(file_bytes, progress, cancel_event),
+                cacheable=is_cacheable_result
+            )
+        else:
+            result = analyze_report(file_bytes, progress, cancel_event)
+
+        if result["status"] == "no_text":
             return "❌ No extractable text found in the PDF document.\nThis may be a scanned document - try using OCR-enabled PDFs."
         
-        if not is_medical(text):
+        if result["status"] == "not_medical":
             return "⚠️ The uploaded document does not appear to be a medical report.\nPlease upload a valid medical document for analysis."
 
-        # Process text (limit to first 10,000 characters for performance)
-        processed_text = text[:10000]
-        
-        # Extract medical information
-        symptoms = extract_symptoms(processed_text)
-        predicted_diseases = predict_disease(symptoms, processed_text)
-        suggested_actions = suggest_actions(predicted_diseases, symptoms)
-        
-        # Generate summary using chunks
-        chunks = chunk_text(processed_text, max_chunk_size=900)
-        
-        if not chunks:
-            return "❌ Unable to process document content for summarization."
-
-        chunk_summaries = []
-        for chunk in chunks[:5]:  # Limit to first 5 chunks
-            try:
-                summary = summarizer(chunk, max_length=120, min_length=40, do_sample=False)
-                chunk_summaries.append(summary[0]["summary_text"])
-            except Exception as e:
-                chunk_summaries.append(f"Chunk processing error: {str(e)}")
-
-        # Combine and create final summary
-        if chunk_summaries:
-            combined_text = " ".join(chunk_summaries)
-            try:
-                final_summary = summarizer(combined_text, max_length=200, min_length=50, do_sample=False)
-                summary_text = final_summary[0]["summary_text"]
-            except Exception as e:
-                summary_text = "Summary generation incomplete due to processing limitations."
-        else:
-            summary_text = "Unable to generate detailed summary from document content."
-
         # Format the complete analysis
         formatted_result = format_medical_summary(
-            summary_text, 
-            symptoms, 
-            predicted_diseases, 
-            suggested_actions
+            result["summary"], 
+            result["symptoms"], 
+            [tuple(disease) for disease in result["diseases"]], 
+            result["actions"]
         )
         
         return formatted_result
 
+    except AnalysisCancelled:
+        raise
     except Exception as e:
         return f"❌ Analysis Error: {str(e)}\nPlease ensure the PDF is not corrupted and try again."
\ No newline at end of file
@@ -0,0 +1,148 @@
+# modules/snapshot.py
+#
+# Compiled binary snapshots of the data CSVs. A snapshot is one file: a
+# JSON header followed by one fixed-width array per column, each aligned
+# so it can be memory-mapped in place. Loading skips CSV parsing entirely,
+# and processes mapping the same snapshot share its pages.
+
+import hashlib
+import json
+import logging
+import os
+import struct
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SNAPSHOT_DIR = os.path.join(BASE_DIR, "cache", "snapshots")
+
+MAGIC = b"DWSNAP1\0"
+ALIGNMENT = 64
+
+logger = logging.getLogger(__name__)
+
+def csv_signature(csv_path):
+    """Version stamp of a CSV, "<mtime ns>:<size>"; changes whenever the file is rewritten"""
+    stat = os.stat(csv_path)
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+def snapshot_path(csv_path, version=None):
+    # Named after the CSV plus a hash of its full path, so same-named CSVs in
+    # different directories never share a snapshot; a version (such as the
+    # CSV signature) gives each version its own file
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    path_hash = hashlib.sha1(os.path.abspath(csv_path).encode("utf-8")).hexdigest()[:10]
+    name = f"{name}.{path_hash}"
+    if version is not None:
+        name = f"{name}.{version.replace(':', '-')}"
+    return os.path.join(SNAPSHOT_DIR, f"{name}.snap")
+
+def _encode(df, categorical):
+    # (column header, array) per column; strings become fixed-width unicode
+    for name in df.columns:
+        series = df[name]
+        if name in categorical:
+            values = pd.Categorical(series)
+            yield {"name": name, "kind": "category", "categories": list(values.categories)}, \
+                values.codes.astype(np.int32)
+        elif pd.api.types.is_numeric_dtype(series):
+            yield {"name": name, "kind": "numeric"}, series.to_numpy()
+        else:
+            yield {"name": name, "kind": "string"}, series.fillna("").astype(str).to_numpy(dtype=str)
+
+def compile_snapshot(csv_path, path=None, categorical=()):
+    """Parse the CSV once and write its snapshot; returns the snapshot path"""
+    path = path or snapshot_path(csv_path)
+    signature = [csv_signature(csv_path), sorted(categorical)]
+    df = pd.read_csv(csv_path)
+    columns, arrays = [], []
+    for column, array in _encode(df, set(categorical)):
+        column.update(dtype=array.dtype.str, length=len(array))
+        columns.append(column)
+        arrays.append(np.ascontiguousarray(array))
+
+    # The header records the offsets, so reserve room for them before laying out
+    header_size = len(json.dumps({"signature": signature, "rows": len(df), "columns": columns}))
+    header_size += 32 * len(columns)
+    offset = len(MAGIC) + 8 + header_size
+    for column, array in zip(columns, arrays):
+        offset += -offset % ALIGNMENT
+        column["offset"] = offset
+        offset += array.nbytes
+    header = json.dumps({"signature": signature, "rows": len(df), "columns": columns}).encode("utf-8")
+    assert len(header) <= header_size
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC + struct.pack("<Q", len(header)) + header)
+        for column, array in zip(columns, arrays):
+            f.write(b"\0" * (column["offset"] - f.tell()))
+            f.write(array.tobytes())
+    os.replace(tmp_path, path)
+    return path
+
+def _read_header(path):
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            return None
+        (size,) = struct.unpack("<Q", f.read(8))
+        return json.loads(f.read(size))
+
+def load_snapshot(path):
+    """Columns of a snapshot as (header, dict of name -> read-only array)
+
+    Category columns map to their int32 codes (-1 for missing); the
+    category labels are in the header.
+    """
+    header = _read_header(path)
+    arrays = {}
+    for column in header["columns"]:
+        arrays[column["name"]] = np.memmap(path, dtype=np.dtype(column["dtype"]), mode="r",
+                                           offset=column["offset"], shape=(column["length"],))
+    return header, arrays
+
+def _is_current(path, csv_path, categorical):
+    if not os.path.exists(path):
+        return False
+    try:
+        header = _read_header(path)
+    except (OSError, ValueError, struct.error):
+        return False
+    return header is not None and header["signature"] == [csv_signature(csv_path), sorted(categorical)]
+
+def load_table(csv_path, categorical=(), path=None):
+    """The CSV as a DataFrame, served from its snapshot
+
+    The snapshot (at ``path``, default snapshot_path(csv_path)) is
+    recompiled first when missing or when the CSV's mtime or size no
+    longer matches the one it was built from. Numeric columns stay
+    backed by the mapped file; ``categorical`` columns come back as
+    pandas categoricals. When the snapshot cannot be written or read
+    (e.g. a read-only install), the CSV is parsed directly instead.
+    """
+    path = path or snapshot_path(csv_path)
+    try:
+        if not _is_current(path, csv_path, categorical):
+            compile_snapshot(csv_path, path, categorical)
+        header, arrays = load_snapshot(path)
+    except OSError as e:
+        logger.warning("Snapshot of %s unavailable (%s); reading the CSV", csv_path, e)
+        df = pd.read_csv(csv_path)
+        for name in categorical:
+            df[name] = df[name].astype("category")
+        return df
+    data = {}
+    for column in header["columns"]:
+        name = column["name"]
+        if column["kind"] == "category":
+            data[name] = pd.Categorical.from_codes(arrays[name], column["categories"])
+        elif column["kind"] == "string":
+            # read_csv never yields "", so it can only stand for a missing value
+            values = arrays[name].astype(object)
+            values[values == ""] = np.nan
+            data[name] = values
+        else:
+            data[name] = arrays[name]
+    return pd.DataFrame(data, copy=False)
@@ -0,0 +1,110 @@
+# modules/term_index.py
+
+from bisect import bisect_left
+from collections import deque
+
+class TermIndex:
+    """Aho-Corasick automaton over a fixed, categorized vocabulary
+
+    Built once from ``{category: [terms]}``; scan() then reports every
+    occurrence of every term, overlaps included, in one left-to-right
+    pass, so the cost follows the text length rather than vocabulary
+    size × text length. Terms are matched as lowercase substrings, the
+    same way the old ``term in text.lower()`` checks did.
+    """
+
+    def __init__(self, vocabularies):
+        self.terms = []
+        self.categories = []
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+
+        term_ids = {}
+        for category, terms in vocabularies.items():
+            for term in terms:
+                term = term.lower()
+                if term not in term_ids:
+                    term_ids[term] = len(self.terms)
+                    self.terms.append(term)
+                    self.categories.append(set())
+                    self._add(term, term_ids[term])
+                self.categories[term_ids[term]].add(category)
+        self._link()
+
+    def _add(self, term, term_id):
+        node = 0
+        for ch in term:
+            child = self._goto[node].get(ch)
+            if child is None:
+                child = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+                self._goto[node][ch] = child
+            node = child
+        self._out[node] += (term_id,)
+
+    def _link(self):
+        # Breadth-first, so every fail target is finished before it is used
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(ch, 0)
+                self._out[child] += self._out[self._fail[child]]
+
+    def scan(self, text):
+        """All term occurrences in (already lowercased) text"""
+        goto, fail, out = self._goto, self._fail, self._out
+        lengths = [len(term) for term in self.terms]
+        hits = []
+        node = 0
+        for end, ch in enumerate(text, 1):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for term_id in out[node]:
+                hits.append((end - lengths[term_id], end, term_id))
+        return TermMatches(self, hits)
+
+
+class TermMatches:
+    """Result of TermIndex.scan: (start, end, term) hits ordered by start"""
+
+    def __init__(self, index, hits):
+        self._index = index
+        self._hits = sorted(hits)
+        self._starts = [hit[0] for hit in self._hits]
+
+    def __iter__(self):
+        terms = self._index.terms
+        for start, end, term_id in self._hits:
+            yield start, end, terms[term_id]
+
+    def __len__(self):
+        return len(self._hits)
+
+    def _in(self, term_id, category):
+        return category is None or category in self._index.categories[term_id]
+
+    def found(self, category=None):
+        """Distinct terms seen, optionally only those of one category"""
+        terms = self._index.terms
+        return {terms[term_id] for _, _, term_id in self._hits if self._in(term_id, category)}
+
+    def between(self, start, end, category=None):
+        """Hits lying entirely inside text[start:end]"""
+        terms = self._index.terms
+        first = bisect_left(self._starts, start)
+        last = bisect_left(self._starts, end)
+        return [(s, e, terms[term_id]) for s, e, term_id in self._hits[first:last]
+                if e <= end and self._in(term_id, category)]
+
+    def until(self, end):
+        """The hits that fit in text[:end], e.g. for a truncated copy of the text"""
+        return TermMatches(self._index, [hit for hit in self._hits if hit[1] <= end])
@@ -0,0 +1,93 @@
+# modules/typeahead.py
+
+import threading
+
+from modules.disease_mapper import disease_df
+from modules.doctor_filtering import current_dataset
+
+SUGGESTION_LIMIT = 5
+
+class _Node:
+    __slots__ = ("children", "top")
+
+    def __init__(self):
+        self.children = {}
+        self.top = []
+
+
+class PrefixTrie:
+    """Prefix trie whose every node stores its own top-k completions
+
+    Terms are inserted heaviest first, so each node's list fills in weight
+    order and never needs re-sorting; a lookup is one step per typed
+    character and returns the precomputed list. Multi-word terms are also
+    reachable from their later words ("pressure" -> "High Blood Pressure"),
+    ranked after every term whose name itself starts with the prefix.
+    """
+
+    def __init__(self, weighted_terms, k=SUGGESTION_LIMIT):
+        self.k = k
+        self._root = _Node()
+        terms = [term for term, _ in sorted(weighted_terms, key=lambda item: (-item[1], item[0]))]
+        for term in terms:
+            self._insert(" ".join(term.lower().split()), term)
+        for term in terms:
+            words = term.lower().split()
+            for i in range(1, len(words)):
+                self._insert(" ".join(words[i:]), term)
+
+    def _insert(self, key, term):
+        node = self._root
+        self._offer(node, term)
+        for ch in key:
+            node = node.children.setdefault(ch, _Node())
+            self._offer(node, term)
+
+    def _offer(self, node, term):
+        if len(node.top) < self.k and term not in node.top:
+            node.top.append(term)
+
+    def complete(self, prefix, k=None):
+        node = self._root
+        for ch in " ".join(prefix.lower().split()):
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        return node.top[:k or self.k]
+
+
+_tries = {}
+_tries_lock = threading.Lock()
+
+def _build_conditions(dataset):
+    # A condition is as popular as the number of doctors who can treat it
+    counts = dataset.value_counts("Specialist")
+    doctors_per_specialist = counts.groupby(counts.index.str.lower()).sum()
+    weighted = []
+    for disease, specialist in zip(disease_df["Disease"].str.strip(), disease_df["Specialist"].str.strip()):
+        weighted.append((disease, int(doctors_per_specialist.get(specialist.lower(), 0))))
+    return PrefixTrie(weighted)
+
+def _build_locations(dataset):
+    counts = dataset.value_counts("Location")
+    return PrefixTrie([(location, int(count)) for location, count in counts.items()])
+
+def _trie(name, build):
+    # Rebuilt when the doctor data changes, since the weights come from it
+    dataset = current_dataset()
+    version, trie = _tries.get(name, (None, None))
+    if version != dataset.version:
+        with _tries_lock:
+            version, trie = _tries.get(name, (None, None))
+            if version != dataset.version:
+                trie = build(dataset)
+                _tries[name] = (dataset.version, trie)
+    return trie
+
+def suggest_conditions(prefix, k=SUGGESTION_LIMIT):
+    """Disease names completing prefix, most-served first"""
+    return _trie("conditions", _build_conditions).complete(prefix, k) if prefix.strip() else []
+
+def suggest_locations(prefix, k=SUGGESTION_LIMIT):
+    """Doctor locations completing prefix, busiest first"""
+    return _trie("locations", _build_locations).complete(prefix, k) if prefix.strip() else []